@@ -4,5 +4,25 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class CampaignSettings(BaseSettings):
     IMAGE_MAX_SIZE: int = 25 * 1024 * 1024
 
+    # Gmail allows 250 quota units per second per user, messages.send costs 100
+    GMAIL_QUOTA_UNITS_PER_SECOND: float = 250
+    GMAIL_SEND_QUOTA_UNITS: int = 100
+    GMAIL_MESSAGES_PER_SECOND: float = 5
+    GMAIL_MESSAGES_BURST: int = 5
+    GMAIL_MAX_IN_FLIGHT_PER_USER: int = 10
+    # Messages per Gmail batch request. 10 is the production setting, it stays
+    # well under GMAIL_BATCH_MAX_SIZE so a throttled batch retries few parts.
+    # 1 sends every message on its own
+    GMAIL_SEND_BATCH_SIZE: int = 10
+    SEND_QUOTA_RESERVATION_SIZE: int = 50
+    CAMPAIGN_CHUNK_SIZE: int = 500
+    RECIPIENT_STATUS_FLUSH_SIZE: int = 20
+    CAMPAIGN_MAX_CHUNKS_IN_FLIGHT: int = 8
+    CAMPAIGN_CHUNK_RELEASE_INTERVAL_SECONDS: float = 10
+    CAMPAIGN_CHUNK_LEASE_SECONDS: float = 60 * 60
+    CAMPAIGN_MAX_PRIORITY: int = 9
+    SCHEDULED_CAMPAIGN_POLL_INTERVAL_SECONDS: float = 15
+    SCHEDULED_CAMPAIGN_DISPATCH_BATCH_SIZE: int = 100
+
 
 campaign_settings = CampaignSettings()
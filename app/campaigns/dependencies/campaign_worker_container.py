@@ -0,0 +1,101 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cached_property
+import httpx
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from campaigns.config.campaign_config import campaign_settings
+from campaigns.services.campaign_chunk_scheduler import CampaignChunkScheduler
+from campaigns.services.campaign_sender_service import CampaignSenderService
+from campaigns.services.campaign_service import CampaignService
+from campaigns.services.recipient_service import RecipientService
+from campaigns.services.scheduled_campaign_service import ScheduledCampaignService
+from campaigns.services.send_quota_service import SendQuotaService
+from common.db.database import AsyncSessionLocal
+from common.http.http_client import get_http_client
+from common.redis.redis_client import get_redis_client
+from common.storage.blob_store import blob_store
+from google_integration.auth.services.google_token_manager import (
+    google_token_manager,
+)
+from google_integration.gmail.clients.gmail_api_client import GmailApiClient
+from google_integration.gmail.services.gmail_service import GoogleGmailService
+from subscriptions.services.subscription_service import SubscriptionService
+
+
+class CampaignWorkerContainer:
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis_client: Redis,
+        http_client: httpx.AsyncClient,
+    ) -> None:
+        self._db = db
+        self._redis_client = redis_client
+        self._http_client = http_client
+
+    @cached_property
+    def campaign_service(self) -> CampaignService:
+        return CampaignService(
+            db=self._db,
+            redis_client=self._redis_client,
+            blob_store=blob_store,
+        )
+
+    @cached_property
+    def recipient_service(self) -> RecipientService:
+        return RecipientService(db=self._db)
+
+    @cached_property
+    def scheduled_campaign_service(self) -> ScheduledCampaignService:
+        return ScheduledCampaignService(db=self._db)
+
+    @cached_property
+    def subscription_service(self) -> SubscriptionService:
+        return SubscriptionService(
+            db=self._db,
+            campaign_service=self.campaign_service,
+            redis_client=self._redis_client,
+        )
+
+    @cached_property
+    def google_gmail_service(self) -> GoogleGmailService:
+        return GoogleGmailService(
+            google_token_manager=google_token_manager,
+            gmail_api_client=GmailApiClient(http_client=self._http_client),
+        )
+
+    @cached_property
+    def send_quota_service(self) -> SendQuotaService:
+        return SendQuotaService(redis_client=self._redis_client)
+
+    @cached_property
+    def campaign_chunk_scheduler(self) -> CampaignChunkScheduler:
+        return CampaignChunkScheduler(
+            redis_client=self._redis_client,
+            max_chunks_in_flight=campaign_settings.CAMPAIGN_MAX_CHUNKS_IN_FLIGHT,
+            quantum=campaign_settings.CAMPAIGN_CHUNK_SIZE,
+            lease_seconds=campaign_settings.CAMPAIGN_CHUNK_LEASE_SECONDS,
+        )
+
+    @cached_property
+    def campaign_sender_service(self) -> CampaignSenderService:
+        return CampaignSenderService(
+            campaign_service=self.campaign_service,
+            recipient_service=self.recipient_service,
+            subscription_service=self.subscription_service,
+            google_gmail_service=self.google_gmail_service,
+            send_quota_service=self.send_quota_service,
+        )
+
+
+@asynccontextmanager
+async def campaign_worker_container() -> AsyncIterator[CampaignWorkerContainer]:
+    # Session and clients come from the worker process pools, not the API ones
+    async with AsyncSessionLocal() as db:
+        yield CampaignWorkerContainer(
+            db=db,
+            redis_client=await get_redis_client(),
+            http_client=await get_http_client(),
+        )
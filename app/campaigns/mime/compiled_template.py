@@ -0,0 +1,38 @@
+import re
+from collections.abc import Callable, Mapping
+
+PLACEHOLDER_PATTERN = re.compile(r"{{\s*([A-Za-z_][A-Za-z0-9_]*)\s*}}")
+
+
+class CompiledTemplate:
+    def __init__(self, source: str) -> None:
+        parts = PLACEHOLDER_PATTERN.split(source)
+
+        # Literal text is escaped for str.format and placeholders become fields,
+        # so rendering is a single format_map call
+        self._format = "".join(
+            (f"{{{part}}}" if index % 2 else part.replace("{", "{{").replace("}", "}}"))
+            for index, part in enumerate(parts)
+        )
+        self._source = source
+        self.variables = frozenset(parts[1::2])
+
+    @property
+    def is_static(self) -> bool:
+        return not self.variables
+
+    def render(
+        self,
+        fields: Mapping[str, str] | None = None,
+        escape: Callable[[str], str] | None = None,
+    ) -> str:
+        if self.is_static:
+            return self._source
+
+        fields = fields or {}
+        values = {name: str(fields.get(name) or "") for name in self.variables}
+
+        if escape is not None:
+            values = {name: escape(value) for name, value in values.items()}
+
+        return self._format.format_map(values)
@@ -0,0 +1,57 @@
+import base64
+import html
+from collections.abc import Mapping
+from email.header import Header
+from email.utils import make_msgid
+
+from campaigns.mime.compiled_template import CompiledTemplate
+
+BODY_MARKER = b"__QUICKSEND_BODY__"
+
+
+class MessageTemplate:
+    def __init__(
+        self,
+        skeleton: bytes,
+        msgid_domain: str | None = None,
+        subject: CompiledTemplate | None = None,
+        body: CompiledTemplate | None = None,
+    ) -> None:
+        # A personalized body is cut out of the skeleton at the marker, only the
+        # part after it is shared between recipients
+        if body is not None:
+            self._head, tail = skeleton.split(BODY_MARKER, 1)
+        else:
+            self._head, tail = b"", skeleton
+
+        # The encoded tail can be appended to any prefix whose length is a
+        # multiple of 3 bytes, because base64 then never spans the join
+        self._encoded_tail = base64.urlsafe_b64encode(tail)
+        self._msgid_domain = msgid_domain
+        self._subject = subject
+        self._body = body
+
+    def render(self, recipient: str, fields: Mapping[str, str] | None = None) -> str:
+        headers = (
+            f" {recipient}\r\nMessage-ID: {make_msgid(domain=self._msgid_domain)}\r\n"
+        )
+
+        if self._subject is not None:
+            # Long subjects are folded, and the folds must use CRLF like the
+            # rest of the message
+            subject = Header(
+                self._subject.render(fields), "utf-8", header_name="Subject"
+            ).encode(linesep="\r\n")
+            headers += f"Subject: {subject}\r\n"
+
+        prefix = headers.encode("utf-8") + self._head
+
+        if self._body is not None:
+            body = self._body.render(fields, escape=html.escape).encode("utf-8")
+            prefix += base64.encodebytes(body).rstrip(b"\n").replace(b"\n", b"\r\n")
+
+        padding = b" " * (-(len(prefix) + len(b"To:")) % 3)
+
+        encoded_prefix = base64.urlsafe_b64encode(b"To:" + padding + prefix)
+
+        return (encoded_prefix + self._encoded_tail).decode("ascii")
@@ -6,7 +6,7 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
-    Text,
+    Uuid,
 )
 
 from common.db.database import Base
@@ -19,9 +19,9 @@ class Attachment(Base):
     filename = Column(String, nullable=False)
     size = Column(Integer, nullable=False)
     mimetype = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
+    sha256 = Column(String(64), nullable=False, index=True)
     uploaded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"))
+    campaign_id = Column(Uuid, ForeignKey("campaigns.id"))
 
     campaign = relationship(argument="Campaign", back_populates="attachments")
@@ -1,3 +1,4 @@
+import uuid
 from sqlalchemy.orm import relationship
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Uuid
 from datetime import datetime
@@ -9,16 +10,19 @@ from campaigns.enum.campaign_status import CampaignStatus
 class Campaign(Base):
     __tablename__ = "campaigns"
 
-    id = Column(Uuid, primary_key=True, index=True, autoincrement=True)
+    id = Column(Uuid, primary_key=True, index=True, default=uuid.uuid4)
     sender_name = Column(String, nullable=True)
     subject = Column(String, nullable=False)
     body_template = Column(Text, nullable=True)
     status = Column(Enum(CampaignStatus), default=CampaignStatus.DRAFT)
     started_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     end_at = Column(DateTime, nullable=True)
+    sent_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=1)
 
     user_id = Column(Integer, ForeignKey("users.id"))
 
     user = relationship("User", back_populates="campaigns")
-    recipients = relationship("Recipient", back_populates="campaigns")
+    recipients = relationship("Recipient", back_populates="campaign")
     attachments = relationship("Attachment", back_populates="campaign")
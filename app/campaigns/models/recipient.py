@@ -1,18 +1,39 @@
-from sqlalchemy import Uuid, Column, Integer, ForeignKey, DateTime
+import uuid
+from sqlalchemy import (
+    JSON,
+    Uuid,
+    Column,
+    ForeignKey,
+    DateTime,
+    Enum,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy_utils import EmailType
 from datetime import datetime
 
 from common.db.database import Base
+from campaigns.enum.recipient_status import RecipientStatus
 
 
 class Recipient(Base):
     __tablename__ = "recipients"
+    __table_args__ = (UniqueConstraint("campaign_id", "email"),)
 
-    id = Column(Uuid, primary_key=True, autoincrement=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     email = Column(EmailType, nullable=False)
+    status = Column(
+        Enum(RecipientStatus), nullable=False, default=RecipientStatus.PENDING
+    )
+    gmail_message_id = Column(String, nullable=True)
+    error = Column(String(255), nullable=True)
+    fields = Column(JSON, nullable=True)
     sent_at = Column(DateTime, nullable=True)
 
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"))
+    campaign_id = Column(Uuid, ForeignKey("campaigns.id"), index=True)
 
     campaign = relationship(argument="Campaign", back_populates="recipients")
+
+    def get_template_fields(self) -> dict[str, str]:
+        return {**(self.fields or {}), "email": self.email}
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Uuid
+
+from common.db.database import Base
+
+
+class ScheduledCampaign(Base):
+    __tablename__ = "scheduled_campaigns"
+
+    campaign_id = Column(Uuid, ForeignKey("campaigns.id"), primary_key=True)
+    scheduled_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    campaign = relationship(argument="Campaign")
@@ -1,7 +1,6 @@
 import json
-from datetime import datetime
+import uuid
 from typing import Annotated, Optional
-import pytz
 from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File
 from starlette import status
 from starlette.responses import JSONResponse
@@ -12,16 +11,25 @@ from campaigns.services.attachment_service import (
 )
 from campaigns.services.campaign_service import CampaignService, get_campaign_service
 from campaigns.services.recipient_service import RecipientService, get_recipient_service
-from google_integration.gmail.services.gmail_service import (
-    GoogleGmailService,
-    get_google_gmail_service,
+from campaigns.services.scheduled_campaign_service import (
+    ScheduledCampaignService,
+    get_scheduled_campaign_service,
+)
+from campaigns.schemas.reschedule_campaign_request import RescheduleCampaignRequest
+from google_integration.auth.services.google_token_manager import (
+    GoogleTokenManager,
+    get_google_token_manager,
+)
+from google_integration.sheet.services.google_sheets_service import (
+    GoogleSheetsService,
+    get_google_sheets_service,
 )
 from subscriptions.services.subscription_service import (
     SubscriptionService,
     get_subscription_service,
 )
 from users.dependencies.get_current_user import get_current_user
-from users.models.user import User
+from users.schemas.user_snapshot import UserSnapshot
 from campaigns.tasks.send_emails_task import send_emails_task
 
 
@@ -32,22 +40,31 @@ campaign_router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
 async def start_campaign(
     body: Annotated[str, Form(..., min_length=10)],
     files: Annotated[Optional[list[UploadFile]], None],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
     attachment_service: Annotated[AttachmentService, Depends(get_attachment_service)],
     recipient_service: Annotated[RecipientService, Depends(get_recipient_service)],
     campaign_service: Annotated[CampaignService, Depends(get_campaign_service)],
     subscription_service: Annotated[
         SubscriptionService, Depends(get_subscription_service)
     ],
-    google_gmail_service: Annotated[
-        GoogleGmailService, Depends(get_google_gmail_service)
+    scheduled_campaign_service: Annotated[
+        ScheduledCampaignService, Depends(get_scheduled_campaign_service)
+    ],
+    google_token_manager: Annotated[
+        GoogleTokenManager, Depends(get_google_token_manager)
+    ],
+    google_sheets_service: Annotated[
+        GoogleSheetsService, Depends(get_google_sheets_service)
     ],
 ) -> JSONResponse:
     campaign_data = json.loads(body) if body else {}
 
-    recipients = campaign_data.get("recipients", [])
+    recipients = recipient_service.normalize_recipients(
+        campaign_data.get("recipients", [])
+    )
+    spreadsheet = campaign_data.get("spreadsheet")
 
-    if not recipients:
+    if not recipients and not spreadsheet:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Please provide recipients",
@@ -73,75 +90,155 @@ async def start_campaign(
 
     campaign_attachments = []
     for file in files:
-        prepared_attachment = await attachment_service.prepare_attachment_for_gmail(
-            file
-        )
+        prepared_attachment = await attachment_service.store_attachment(file)
 
         campaign_attachment = await attachment_service.create_attachment(
             campaign=campaign,
             filename=prepared_attachment["filename"],
             size=prepared_attachment["size"],
             mimetype=prepared_attachment["mimetype"],
-            content=prepared_attachment["content"],
+            sha256=prepared_attachment["sha256"],
         )
         campaign_attachments.append(campaign_attachment)
 
-    campaign_recipients = []
-    for recipient in recipients:
-        campaign_recipient = await recipient_service.create_recipient(
-            campaign=campaign,
-            email=recipient["email"],
-        )
-
-        campaign_recipients.append(campaign_recipient)
-
+    scheduled_datetime = None
     if campaign_data.get("date") and campaign_data.get("time"):
-        scheduled_datetime = campaign_service.process_time_for_campaign_time(
+        scheduled_datetime = await campaign_service.process_time_for_campaign_time(
             campaign_date=campaign_data.get("date"),
             campaign_time=campaign_data.get("time"),
             user_timezone_str=current_user.timezone,
         )
-    else:
-        scheduled_datetime = datetime.now(pytz.utc)
 
-    send_emails_task.apply_async(
-        args=[campaign, campaign_service, subscription_service, google_gmail_service],
-        queue="email_campaigns",
-        eta=scheduled_datetime,
+        await scheduled_campaign_service.schedule_campaign(
+            campaign=campaign,
+            scheduled_at=scheduled_datetime,
+        )
+
+    # Sheet rows are normalized and inserted page by page, never held in full
+    if spreadsheet:
+        access_token = await google_token_manager.get_access_token(current_user.id)
+
+        async for rows in google_sheets_service.iter_spreadsheet_rows(
+            spreadsheet_id=spreadsheet["spreadsheet_id"],
+            range=spreadsheet["range"],
+            access_token=access_token,
+        ):
+            await recipient_service.add_recipients(
+                campaign=campaign,
+                recipients=recipient_service.normalize_recipients(rows),
+            )
+
+        if not recipients and not (
+            await recipient_service.get_recipients_count_for_campaign(campaign)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No valid emails found in spreadsheet {spreadsheet['spreadsheet_id']}",
+            )
+
+    # Campaign and attachments are only flushed, so they commit together with the recipients
+    await recipient_service.create_recipients(
+        campaign=campaign,
+        recipients=recipients,
     )
 
+    # Scheduled campaigns are sent by the dispatcher once they are due
+    if scheduled_datetime is None:
+        send_emails_task.apply_async(args=[str(campaign.id), campaign.version])
+
     return JSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"message": "Campaign successfully created"},
     )
 
 
+@campaign_router.post("/{campaign_id}/cancel")
+async def cancel_campaign(
+    campaign_id: uuid.UUID,
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
+    scheduled_campaign_service: Annotated[
+        ScheduledCampaignService, Depends(get_scheduled_campaign_service)
+    ],
+) -> JSONResponse:
+    if not await scheduled_campaign_service.cancel_campaign(current_user, campaign_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scheduled campaign {campaign_id} not found",
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"message": "Campaign successfully cancelled"},
+    )
+
+
+@campaign_router.post("/{campaign_id}/reschedule")
+async def reschedule_campaign(
+    campaign_id: uuid.UUID,
+    request: RescheduleCampaignRequest,
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
+    campaign_service: Annotated[CampaignService, Depends(get_campaign_service)],
+    scheduled_campaign_service: Annotated[
+        ScheduledCampaignService, Depends(get_scheduled_campaign_service)
+    ],
+) -> JSONResponse:
+    scheduled_datetime = await campaign_service.process_time_for_campaign_time(
+        campaign_date=request.date,
+        campaign_time=request.time,
+        user_timezone_str=current_user.timezone,
+    )
+
+    if not await scheduled_campaign_service.reschedule_campaign(
+        current_user, campaign_id, scheduled_datetime
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Scheduled campaign {campaign_id} not found",
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"message": "Campaign successfully rescheduled"},
+    )
+
+
 @campaign_router.get("/all")
 async def get_all_campaigns(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
+    campaign_service: Annotated[CampaignService, Depends(get_campaign_service)],
 ) -> JSONResponse:
+    campaigns = await campaign_service.get_campaigns_for_user(current_user)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "campaigns": current_user.campaigns,
+            "campaigns": [
+                {
+                    "id": str(campaign.id),
+                    "subject": campaign.subject,
+                    "status": campaign.status.value if campaign.status else None,
+                    "started_at": campaign.started_at.isoformat(),
+                }
+                for campaign in campaigns
+            ],
         },
     )
 
 
 @campaign_router.get("/statistics")
 async def get_campaigns_statistics(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
+    campaign_service: Annotated[CampaignService, Depends(get_campaign_service)],
 ) -> JSONResponse:
-    campaigns = current_user.campaigns
-
-    recipients_count = 0
-    for campaign in campaigns:
-        recipients_count += len(campaign.recipients)
+    (
+        campaigns_count,
+        recipients_count,
+    ) = await campaign_service.get_campaigns_statistics_for_user(current_user)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "campaigns_count": len(campaigns),
-            "recipients_count": len(recipients_count),
+            "campaigns_count": campaigns_count,
+            "recipients_count": recipients_count,
         },
     )
@@ -6,7 +6,6 @@ from campaigns.models.attachment import Attachment
 
 class CreateMessage(BaseModel):
     sender_email: EmailStr
-    recipient: str
     subject: str
     body: str
     sender_name: str
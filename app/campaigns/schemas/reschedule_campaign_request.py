@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class RescheduleCampaignRequest(BaseModel):
+    date: str
+    time: str
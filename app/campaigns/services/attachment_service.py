@@ -1,4 +1,3 @@
-import base64
 import mimetypes
 from email import encoders
 from email.mime import base
@@ -12,12 +11,14 @@ from datetime import date
 from campaigns.models.attachment import Attachment
 from campaigns.models.campaign import Campaign
 from common.db.database import get_db
+from common.storage.blob_store import BaseBlobStore, get_blob_store
 from users.models.user import User
 
 
 class AttachmentService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, blob_store: BaseBlobStore):
         self._db = db
+        self._blob_store = blob_store
 
     async def get_recipients_count_by_date_for_user(
         self, user: User, camp_date: date
@@ -32,10 +33,8 @@ class AttachmentService:
 
         return total_count or 0
 
-    async def prepare_attachment_for_gmail(self, file: UploadFile) -> dict[str, Any]:
-        content = b""
-        while chunk := await file.read(8192):
-            content += chunk
+    async def store_attachment(self, file: UploadFile) -> dict[str, Any]:
+        sha256, size = await self._blob_store.put_upload(file)
 
         filename = file.filename or "unnamed"
 
@@ -46,8 +45,8 @@ class AttachmentService:
         return {
             "filename": filename,
             "mimetype": mimetype,
-            "size": len(content),
-            "content": base64.urlsafe_b64encode(content).decode("utf-8"),
+            "size": size,
+            "sha256": sha256,
         }
 
     def create_mime_part_from_attachment(
@@ -75,24 +74,24 @@ class AttachmentService:
         filename: str,
         size: int,
         mimetype: str,
-        content: str,
+        sha256: str,
     ) -> Attachment:
         attachment = Attachment(
             campaign_id=campaign.id,
             filename=filename,
             size=size,
             mimetype=mimetype,
-            content=content,
+            sha256=sha256,
         )
 
         self._db.add(attachment)
-        await self._db.commit()
-        await self._db.refresh(attachment)
+        await self._db.flush()
 
         return attachment
 
 
 async def get_attachment_service(
     db: Annotated[AsyncSession, Depends(get_db)],
+    blob_store: Annotated[BaseBlobStore, Depends(get_blob_store)],
 ) -> AttachmentService:
-    return AttachmentService(db=db)
+    return AttachmentService(db=db, blob_store=blob_store)
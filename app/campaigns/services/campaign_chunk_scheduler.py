@@ -0,0 +1,246 @@
+import json
+import time
+import uuid
+from typing import Any
+from redis.asyncio import Redis
+
+# The release and requeue scripts build per-user queue keys from the users they
+# pop, so those keys cannot be declared up front. Every scheduler key shares the
+# {campaign_chunks} hash tag, which keeps them in one slot on Redis Cluster
+CHUNK_KEY_PREFIX = "{campaign_chunks}"
+CHUNK_USERS_KEY = f"{CHUNK_KEY_PREFIX}:users"
+CHUNK_DEFICITS_KEY = f"{CHUNK_KEY_PREFIX}:deficits"
+CHUNK_PAYLOADS_KEY = f"{CHUNK_KEY_PREFIX}:payloads"
+CHUNKS_IN_FLIGHT_KEY = f"{CHUNK_KEY_PREFIX}:in_flight"
+
+# Queues the user for the round-robin when they get their first waiting chunk.
+# A campaign that already has chunks is not queued again
+ENQUEUE_SCRIPT = """
+if redis.call('EXISTS', KEYS[4]) == 1 then
+    return 0
+end
+
+local was_empty = redis.call('LLEN', KEYS[2]) == 0
+
+for index = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[3], ARGV[index], ARGV[index + 1])
+    redis.call('SADD', KEYS[4], ARGV[index])
+    redis.call('RPUSH', KEYS[2], ARGV[index])
+end
+
+if was_empty then
+    redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+
+return redis.call('LLEN', KEYS[2])
+"""
+
+# Deficit round-robin: every visit adds a quantum of recipients to the user's
+# deficit, and chunks are released while the deficit covers their size.
+# Released chunks are leased in the in-flight set until they finish
+RELEASE_SCRIPT = """
+local capacity = tonumber(ARGV[1]) - redis.call('ZCARD', KEYS[3])
+local quantum = tonumber(ARGV[2])
+local released = {}
+
+while capacity > 0 do
+    local user_id = redis.call('LPOP', KEYS[1])
+
+    if not user_id then
+        break
+    end
+
+    local queue_key = ARGV[3] .. user_id
+    local deficit = tonumber(redis.call('HGET', KEYS[2], user_id) or '0') + quantum
+
+    while capacity > 0 do
+        local chunk_id = redis.call('LINDEX', queue_key, 0)
+
+        if not chunk_id then
+            break
+        end
+
+        local chunk = redis.call('HGET', KEYS[4], chunk_id)
+
+        -- A reclaimed chunk may have finished while it waited to run again
+        if not chunk then
+            redis.call('LPOP', queue_key)
+        else
+            local size = tonumber(cjson.decode(chunk)['size'])
+
+            if size > deficit then
+                break
+            end
+
+            redis.call('LPOP', queue_key)
+            redis.call('ZADD', KEYS[3], ARGV[4], chunk_id)
+            deficit = deficit - size
+            capacity = capacity - 1
+            table.insert(released, chunk)
+        end
+    end
+
+    if redis.call('LLEN', queue_key) > 0 then
+        redis.call('HSET', KEYS[2], user_id, deficit)
+        redis.call('RPUSH', KEYS[1], user_id)
+    else
+        redis.call('HDEL', KEYS[2], user_id)
+    end
+end
+
+return released
+"""
+
+# Puts leased chunks back at the front of their users' queues, in order.
+# Chunks that already finished are no longer leased and are left alone
+REQUEUE_SCRIPT = """
+local requeued = 0
+
+for index = #ARGV, 2, -1 do
+    local chunk_id = ARGV[index]
+    local chunk = redis.call('HGET', KEYS[3], chunk_id)
+
+    if redis.call('ZREM', KEYS[2], chunk_id) == 1 and chunk then
+        local user_id = cjson.decode(chunk)['user_id']
+        local queue_key = ARGV[1] .. user_id
+
+        if redis.call('LLEN', queue_key) == 0 then
+            redis.call('RPUSH', KEYS[1], user_id)
+        end
+
+        redis.call('LPUSH', queue_key, chunk_id)
+        requeued = requeued + 1
+    end
+end
+
+return requeued
+"""
+
+# Removes one specific chunk, so a redelivered chunk cannot finish twice
+FINISH_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+
+if redis.call('SREM', KEYS[3], ARGV[1]) == 0 then
+    return -1
+end
+
+return redis.call('SCARD', KEYS[3])
+"""
+
+
+def get_user_chunks_key(user_id: int | str) -> str:
+    return f"{CHUNK_KEY_PREFIX}:user:{user_id}"
+
+
+def get_campaign_remaining_chunks_key(campaign_id: uuid.UUID) -> str:
+    return f"{CHUNK_KEY_PREFIX}:remaining:{campaign_id}"
+
+
+class CampaignChunkScheduler:
+    def __init__(
+        self,
+        redis_client: Redis,
+        max_chunks_in_flight: int,
+        quantum: int,
+        lease_seconds: float,
+    ) -> None:
+        self._redis_client = redis_client
+        self._max_chunks_in_flight = max_chunks_in_flight
+        self._quantum = quantum
+        self._lease_seconds = lease_seconds
+        self._enqueue_script = redis_client.register_script(ENQUEUE_SCRIPT)
+        self._release_script = redis_client.register_script(RELEASE_SCRIPT)
+        self._requeue_script = redis_client.register_script(REQUEUE_SCRIPT)
+        self._finish_script = redis_client.register_script(FINISH_SCRIPT)
+
+    async def enqueue(
+        self,
+        user_id: int,
+        campaign_id: uuid.UUID,
+        chunks: list[list[str]],
+        priority: int,
+    ) -> None:
+        if not chunks:
+            return
+
+        args = [str(user_id)]
+
+        for index, chunk in enumerate(chunks):
+            chunk_id = f"{campaign_id}:{index}"
+
+            args += [
+                chunk_id,
+                json.dumps(
+                    {
+                        "id": chunk_id,
+                        "user_id": str(user_id),
+                        "campaign_id": str(campaign_id),
+                        "recipient_ids": chunk,
+                        "priority": priority,
+                        "size": len(chunk),
+                    }
+                ),
+            ]
+
+        await self._enqueue_script(
+            keys=[
+                CHUNK_USERS_KEY,
+                get_user_chunks_key(user_id),
+                CHUNK_PAYLOADS_KEY,
+                get_campaign_remaining_chunks_key(campaign_id),
+            ],
+            args=args,
+        )
+
+    async def release(self) -> list[dict[str, Any]]:
+        released = await self._release_script(
+            keys=[
+                CHUNK_USERS_KEY,
+                CHUNK_DEFICITS_KEY,
+                CHUNKS_IN_FLIGHT_KEY,
+                CHUNK_PAYLOADS_KEY,
+            ],
+            args=[
+                self._max_chunks_in_flight,
+                self._quantum,
+                get_user_chunks_key(""),
+                time.time() + self._lease_seconds,
+            ],
+        )
+
+        return [json.loads(chunk) for chunk in released]
+
+    async def requeue(self, chunk_ids: list[str]) -> int:
+        if not chunk_ids:
+            return 0
+
+        return await self._requeue_script(
+            keys=[CHUNK_USERS_KEY, CHUNKS_IN_FLIGHT_KEY, CHUNK_PAYLOADS_KEY],
+            args=[get_user_chunks_key(""), *chunk_ids],
+        )
+
+    async def reclaim_expired(self) -> int:
+        # Chunks whose worker or publish was lost would hold their slot forever
+        chunk_ids = await self._redis_client.zrangebyscore(
+            CHUNKS_IN_FLIGHT_KEY, "-inf", time.time()
+        )
+
+        return await self.requeue(
+            [
+                chunk_id.decode() if isinstance(chunk_id, bytes) else chunk_id
+                for chunk_id in chunk_ids
+            ]
+        )
+
+    async def finish(self, campaign_id: uuid.UUID, chunk_id: str) -> bool:
+        remaining = await self._finish_script(
+            keys=[
+                CHUNKS_IN_FLIGHT_KEY,
+                CHUNK_PAYLOADS_KEY,
+                get_campaign_remaining_chunks_key(campaign_id),
+            ],
+            args=[chunk_id],
+        )
+
+        return int(remaining) == 0
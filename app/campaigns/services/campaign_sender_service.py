@@ -0,0 +1,331 @@
+import asyncio
+import weakref
+from datetime import UTC, datetime
+from typing import Any, Annotated
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from campaigns.config.campaign_config import campaign_settings
+from campaigns.enum.recipient_status import RecipientStatus
+from campaigns.models.campaign import Campaign
+from campaigns.models.recipient import Recipient
+from campaigns.schemas.create_message import CreateMessage
+from campaigns.services.campaign_service import CampaignService, get_campaign_service
+from campaigns.services.recipient_service import RecipientService, get_recipient_service
+from campaigns.services.send_quota_service import (
+    SendQuotaReservation,
+    SendQuotaService,
+    get_send_quota_service,
+)
+from common.log.logger import logger
+from common.rate_limit.redis_token_bucket import RedisTokenBucket
+from common.redis.redis_client import get_redis_client
+from google_integration.gmail.services.gmail_service import (
+    GoogleGmailService,
+    get_google_gmail_service,
+)
+from subscriptions.services.subscription_service import (
+    SubscriptionService,
+    get_subscription_service,
+)
+from users.models.user import User
+
+
+class UserSendLimiter:
+    def __init__(self, user_id: int, redis_client: Redis) -> None:
+        self._in_flight = asyncio.Semaphore(
+            campaign_settings.GMAIL_MAX_IN_FLIGHT_PER_USER
+        )
+        # Rates are shared in Redis, chunks of one campaign may run on several workers
+        self._messages = RedisTokenBucket(
+            redis_client=redis_client,
+            key=f"gmail_rate:{user_id}:messages",
+            rate=campaign_settings.GMAIL_MESSAGES_PER_SECOND,
+            capacity=campaign_settings.GMAIL_MESSAGES_BURST,
+        )
+        self._quota_units = RedisTokenBucket(
+            redis_client=redis_client,
+            key=f"gmail_rate:{user_id}:quota_units",
+            rate=campaign_settings.GMAIL_QUOTA_UNITS_PER_SECOND,
+            capacity=campaign_settings.GMAIL_QUOTA_UNITS_PER_SECOND,
+        )
+
+    async def wait_for_send_rate(self) -> None:
+        await self._messages.acquire()
+        await self._quota_units.acquire(campaign_settings.GMAIL_SEND_QUOTA_UNITS)
+
+    async def acquire(self) -> None:
+        await self._in_flight.acquire()
+
+    def release(self) -> None:
+        self._in_flight.release()
+
+
+# Limiters hold asyncio primitives, so they are scoped to the loop that uses them
+_user_send_limiters: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[int, UserSendLimiter]
+] = weakref.WeakKeyDictionary()
+
+
+async def get_user_send_limiter(user_id: int) -> UserSendLimiter:
+    loop_limiters = _user_send_limiters.setdefault(asyncio.get_running_loop(), {})
+
+    if user_id not in loop_limiters:
+        loop_limiters[user_id] = UserSendLimiter(
+            user_id=user_id,
+            redis_client=await get_redis_client(),
+        )
+
+    return loop_limiters[user_id]
+
+
+class CampaignSenderService:
+    def __init__(
+        self,
+        campaign_service: CampaignService,
+        recipient_service: RecipientService,
+        subscription_service: SubscriptionService,
+        google_gmail_service: GoogleGmailService,
+        send_quota_service: SendQuotaService,
+    ) -> None:
+        self._campaign_service = campaign_service
+        self._recipient_service = recipient_service
+        self._subscription_service = subscription_service
+        self._google_gmail_service = google_gmail_service
+        self._send_quota_service = send_quota_service
+
+    async def send_campaign(
+        self, campaign: Campaign, recipients: list[Recipient]
+    ) -> dict[str, Any]:
+        user = campaign.user
+        limiter = await get_user_send_limiter(user.id)
+
+        results = {
+            "total": len(recipients),
+            "sent": 0,
+            "failed": 0,
+            "errors": [],
+            "message_ids": [],
+        }
+
+        message_template = await self._campaign_service.create_message_template(
+            CreateMessage(
+                sender_email=user.email,
+                sender_name=campaign.sender_name,
+                subject=campaign.subject,
+                body=campaign.body_template,
+                attachments=campaign.attachments,
+                inline_images=None,
+            )
+        )
+
+        recipients_limit = await self._subscription_service.get_user_recipients_limit(
+            user
+        )
+
+        if recipients_limit is None:
+            results["errors"].append(
+                {"recipient": None, "error": "No active subscription"}
+            )
+            results["failed"] = results["total"]
+
+            await self._recipient_service.fail_pending_recipients(
+                [recipient.id for recipient in recipients], "No active subscription"
+            )
+
+            return results
+
+        reservation: SendQuotaReservation | None = None
+        reservations: list[SendQuotaReservation] = []
+        batch: list[tuple[Recipient, str, SendQuotaReservation]] = []
+        recipient_updates: list[dict[str, Any]] = []
+
+        # Sends only talk to Gmail and Redis; every database call stays in this
+        # coroutine, so the shared session is never used concurrently
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for index, recipient in enumerate(recipients):
+                    # Checkpoint delivery state, so a restarted chunk resumes after it.
+                    # Running sends append to this same list, so it is drained in place
+                    if (
+                        len(recipient_updates)
+                        >= campaign_settings.RECIPIENT_STATUS_FLUSH_SIZE
+                    ):
+                        updates = recipient_updates[:]
+                        recipient_updates.clear()
+
+                        await self._recipient_service.update_recipient_statuses(updates)
+
+                    if reservation is None or reservation.remaining == 0:
+                        reservation = await self._send_quota_service.reserve(
+                            user_id=user.id,
+                            limit=recipients_limit,
+                            count=min(
+                                campaign_settings.SEND_QUOTA_RESERVATION_SIZE,
+                                results["total"] - index,
+                            ),
+                        )
+                        reservations.append(reservation)
+
+                    # Nothing after the limit is sent today, the rest of the
+                    # chunk is failed so the campaign totals still add up
+                    if reservation.remaining == 0:
+                        unsent_recipients = recipients[index:]
+
+                        results["errors"].append(
+                            {
+                                "recipient": recipient.email,
+                                "error": "Already used limits",
+                            }
+                        )
+                        results["failed"] += len(unsent_recipients)
+                        recipient_updates.extend(
+                            {
+                                "id": unsent_recipient.id,
+                                "status": RecipientStatus.FAILED,
+                                "error": "Already used limits",
+                            }
+                            for unsent_recipient in unsent_recipients
+                        )
+                        break
+
+                    reservation.used += 1
+
+                    access_token = (
+                        await self._google_gmail_service.get_access_token_for_user(user)
+                    )
+
+                    await limiter.wait_for_send_rate()
+
+                    batch.append(
+                        (
+                            recipient,
+                            message_template.render(
+                                recipient.email, recipient.get_template_fields()
+                            ),
+                            reservation,
+                        )
+                    )
+
+                    if len(batch) >= campaign_settings.GMAIL_SEND_BATCH_SIZE:
+                        await limiter.acquire()
+                        task_group.create_task(
+                            self._send_batch(
+                                user,
+                                batch,
+                                access_token,
+                                limiter,
+                                results,
+                                recipient_updates,
+                            )
+                        )
+                        batch = []
+
+                if batch:
+                    await limiter.acquire()
+                    task_group.create_task(
+                        self._send_batch(
+                            user,
+                            batch,
+                            access_token,
+                            limiter,
+                            results,
+                            recipient_updates,
+                        )
+                    )
+        finally:
+            # Reserved sends that were never made, or that failed, go back to the
+            # quota even when the session is too broken to flush the statuses
+            try:
+                await self._recipient_service.update_recipient_statuses(
+                    recipient_updates
+                )
+            finally:
+                for reservation in reservations:
+                    await self._send_quota_service.release(reservation)
+
+        return results
+
+    async def _send_batch(
+        self,
+        user: User,
+        batch: list[tuple[Recipient, str, SendQuotaReservation]],
+        access_token: str,
+        limiter: UserSendLimiter,
+        results: dict[str, Any],
+        recipient_updates: list[dict[str, Any]],
+    ) -> None:
+        try:
+            if len(batch) == 1:
+                responses = [
+                    await self._google_gmail_service.send_email_via_gmail(
+                        user=user,
+                        raw=batch[0][1],
+                        access_token=access_token,
+                    )
+                ]
+            else:
+                responses = (
+                    await self._google_gmail_service.send_emails_batch_via_gmail(
+                        user=user,
+                        raws=[raw_message for _, raw_message, _ in batch],
+                        access_token=access_token,
+                    )
+                )
+        except Exception as e:
+            responses = [e] * len(batch)
+        finally:
+            limiter.release()
+
+        for (recipient, _, reservation), response in zip(batch, responses):
+            if isinstance(response, Exception):
+                reservation.used -= 1
+                recipient_updates.append(
+                    {
+                        "id": recipient.id,
+                        "status": RecipientStatus.FAILED,
+                        "error": str(response)[:255],
+                    }
+                )
+                results["failed"] += 1
+                results["errors"].append(
+                    {"recipient": recipient.email, "error": str(response)}
+                )
+
+                logger.error(f"Failed to send to {recipient.email}: {str(response)}")
+                continue
+
+            recipient_updates.append(
+                {
+                    "id": recipient.id,
+                    "status": RecipientStatus.SENT,
+                    "gmail_message_id": response.get("id"),
+                    "sent_at": datetime.now(UTC).replace(tzinfo=None),
+                }
+            )
+            results["sent"] += 1
+            results["message_ids"].append(response.get("id"))
+
+            logger.info(
+                f"Email sent to {recipient.email}. Message ID: {response.get('id')}"
+            )
+
+
+async def get_campaign_sender_service(
+    campaign_service: Annotated[CampaignService, Depends(get_campaign_service)],
+    recipient_service: Annotated[RecipientService, Depends(get_recipient_service)],
+    subscription_service: Annotated[
+        SubscriptionService, Depends(get_subscription_service)
+    ],
+    google_gmail_service: Annotated[
+        GoogleGmailService, Depends(get_google_gmail_service)
+    ],
+    send_quota_service: Annotated[SendQuotaService, Depends(get_send_quota_service)],
+) -> CampaignSenderService:
+    return CampaignSenderService(
+        campaign_service=campaign_service,
+        recipient_service=recipient_service,
+        subscription_service=subscription_service,
+        google_gmail_service=google_gmail_service,
+        send_quota_service=send_quota_service,
+    )
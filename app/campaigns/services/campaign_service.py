@@ -1,20 +1,29 @@
 import base64
-from email.encoders import encode_base64
+import uuid
 from email.header import Header
 from email.mime import multipart, text, image, base
-from email.utils import make_msgid
 from typing import Annotated
+from urllib.parse import quote
 import pytz
 from fastapi import Depends, HTTPException, status
 from redis.asyncio import Redis
+from sqlalchemy import distinct, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import date, datetime, timedelta
+from sqlalchemy.orm import selectinload
+from datetime import datetime, timedelta
 
+from campaigns.enum.campaign_status import CampaignStatus
+from campaigns.enum.recipient_status import RecipientStatus
 from campaigns.models.campaign import Campaign
+from campaigns.models.recipient import Recipient
 from campaigns.config.campaign_config import campaign_settings
+from campaigns.mime.compiled_template import CompiledTemplate
+from campaigns.mime.message_template import BODY_MARKER, MessageTemplate
 from campaigns.schemas.create_message import CreateMessage
+from campaigns.services.send_quota_service import get_daily_sent_count_key
 from common.db.database import get_db
 from common.redis.redis_client import get_redis_client
+from common.storage.blob_store import BaseBlobStore, get_blob_store
 from users.models.user import User
 
 
@@ -23,8 +32,10 @@ class CampaignService:
         self,
         db: AsyncSession,
         redis_client: Redis,
+        blob_store: BaseBlobStore,
     ) -> None:
         self._redis_client = redis_client
+        self._blob_store = blob_store
         self._db = db
 
     async def create_campaign_for_user(
@@ -38,23 +49,116 @@ class CampaignService:
         )
 
         self._db.add(campaign)
-        await self._db.commit()
-        await self._db.refresh(campaign)
+        await self._db.flush()
 
         return campaign
 
-    async def create_message_with_attachment(self, message: CreateMessage) -> str:
+    async def get_campaigns_for_user(self, user: User) -> list[Campaign]:
+        result = await self._db.execute(
+            select(Campaign)
+            .where(Campaign.user_id == user.id)
+            .order_by(Campaign.started_at.desc())
+        )
+
+        return list(result.scalars().all())
+
+    async def get_campaign_for_sending(self, campaign_id: uuid.UUID) -> Campaign | None:
+        result = await self._db.execute(
+            select(Campaign)
+            .where(Campaign.id == campaign_id)
+            .options(selectinload(Campaign.user), selectinload(Campaign.attachments))
+        )
+
+        return result.scalar_one_or_none()
+
+    async def claim_campaign_for_sending(
+        self, campaign_id: uuid.UUID, version: int
+    ) -> bool:
+        # Only the dispatch of the current version may start the campaign. A
+        # campaign already sending this version is claimed again, so a retry
+        # after a failed enqueue can resume it
+        result = await self._db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .where(Campaign.version == version)
+            .where(
+                Campaign.status.in_(
+                    [
+                        CampaignStatus.DRAFT,
+                        CampaignStatus.SCHEDULED,
+                        CampaignStatus.SENDING,
+                    ]
+                )
+            )
+            .values(status=CampaignStatus.SENDING)
+            .returning(Campaign.id)
+        )
+        await self._db.commit()
+
+        return result.scalar_one_or_none() is not None
+
+    async def complete_campaign(self, campaign_id: uuid.UUID) -> tuple[int, int]:
+        # Totals come from the recipients, so retried chunks are not counted twice
+        result = await self._db.execute(
+            select(Recipient.status, func.count())
+            .where(Recipient.campaign_id == campaign_id)
+            .group_by(Recipient.status)
+        )
+        status_counts = dict(result.all())
+
+        sent_count = status_counts.get(RecipientStatus.SENT, 0)
+        failed_count = status_counts.get(RecipientStatus.FAILED, 0)
+
+        await self._db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(
+                status=CampaignStatus.SENT,
+                end_at=datetime.now(pytz.utc).replace(tzinfo=None),
+                sent_count=sent_count,
+                failed_count=failed_count,
+            )
+        )
+        await self._db.commit()
+
+        return sent_count, failed_count
+
+    async def get_campaigns_statistics_for_user(self, user: User) -> tuple[int, int]:
+        result = await self._db.execute(
+            select(func.count(distinct(Campaign.id)), func.count(Recipient.id))
+            .select_from(Campaign)
+            .outerjoin(Recipient, Recipient.campaign_id == Campaign.id)
+            .where(Campaign.user_id == user.id)
+        )
+
+        campaigns_count, recipients_count = result.one()
+
+        return campaigns_count, recipients_count
+
+    async def create_message_template(self, message: CreateMessage) -> MessageTemplate:
         msg = multipart.MIMEMultipart()
         msg["From"] = f"{message.sender_name} <{message.sender_email}>"
-        msg["To"] = message.recipient
-        msg["Subject"] = Header(f"{message.subject}", "utf-8")
-        msg["Message-ID"] = make_msgid()
 
-        msg.attach(text.MIMEText(message.body, "html"))
+        subject_template = CompiledTemplate(message.subject)
+        body_template = CompiledTemplate(message.body)
+
+        # Personalized subject and body are rendered per recipient, everything
+        # else is serialized and encoded once per campaign
+        if subject_template.is_static:
+            msg["Subject"] = Header(f"{message.subject}", "utf-8")
+
+        if body_template.is_static:
+            msg.attach(text.MIMEText(message.body, "html"))
+        else:
+            body_part = base.MIMEBase("text", "html", charset="utf-8")
+            body_part.set_payload(BODY_MARKER.decode("ascii"))
+            body_part["Content-Transfer-Encoding"] = "base64"
+
+            msg.attach(body_part)
 
         total_size = 0
 
-        for img_id, img_path in message.inline_images:
+        for img_id, img_path in message.inline_images or []:
             with open(img_path, "rb") as img:
                 img_data = img.read()
                 total_size += len(img_data)
@@ -69,25 +173,31 @@ class CampaignService:
 
                 msg.attach(img_part)
 
-        for attachment in message.attachments:
-            part = base.MIMEBase("application", "octet-stream")
+        for attachment in message.attachments or []:
+            main_type, sub_type = attachment.mimetype.split("/", 1)
+            part = base.MIMEBase(main_type, sub_type)
 
-            part.set_payload(base64.urlsafe_b64decode(attachment["data"]))
-            encode_base64(part)
+            # The blob is mapped, not read, and encoded once per campaign
+            with self._blob_store.open(attachment.sha256) as content:
+                part.set_payload(base64.encodebytes(content).decode("ascii"))
 
-            if attachment.get("encoded_filename"):
-                disposition_str = (
-                    f"attachment; filename*=UTF-8''{attachment['encoded_filename']}"
-                )
-                part.add_header("Content-Disposition", disposition_str)
-            else:
-                part.add_header(
-                    "Content-Disposition", "attachment", filename=attachment["filename"]
-                )
+            part["Content-Transfer-Encoding"] = "base64"
+
+            part.add_header(
+                "Content-Disposition",
+                f"attachment; filename*=UTF-8''{quote(attachment.filename)}",
+            )
 
             msg.attach(part)
 
-        return base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
+        skeleton = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+
+        return MessageTemplate(
+            skeleton=skeleton,
+            msgid_domain=message.sender_email.rsplit("@", 1)[-1],
+            subject=None if subject_template.is_static else subject_template,
+            body=None if body_template.is_static else body_template,
+        )
 
     async def process_time_for_campaign_time(
         self, campaign_date: str, campaign_time: str, user_timezone_str: str | None
@@ -117,26 +227,18 @@ class CampaignService:
         return scheduled_datetime_utc
 
     async def get_user_daily_sent_count(self, user: User) -> int:
-        key = f"sent:{user.id}:{date.today()}"
-        count = await self._redis_client.get(key)
+        count = await self._redis_client.get(get_daily_sent_count_key(user.id))
 
         return int(count) if count else 0
 
-    async def increment_user_sent_count(self, user: User) -> int:
-        key = f"sent:{user.id}:{date.today()}"
-        new_count = await self._redis_client.incr(key)
-
-        if new_count == 1:
-            await self._redis_client.expire(key, timedelta(days=1))
-
-        return new_count
-
 
 async def get_campaign_service(
     db: Annotated[AsyncSession, Depends(get_db)],
     redis_client: Annotated[Redis, Depends(get_redis_client)],
+    blob_store: Annotated[BaseBlobStore, Depends(get_blob_store)],
 ) -> CampaignService:
     return CampaignService(
         db=db,
         redis_client=redis_client,
+        blob_store=blob_store,
     )
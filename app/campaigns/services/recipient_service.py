@@ -1,13 +1,18 @@
-from typing import Annotated
+import uuid
+from collections.abc import Iterable
+from typing import Any, Annotated
+from email_validator import EmailNotValidError, validate_email
 from fastapi import Depends
-from pydantic import EmailStr
-from sqlalchemy import func, Date, cast
+from sqlalchemy import func, Date, cast, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
 
+from campaigns.enum.recipient_status import RecipientStatus
 from campaigns.models.campaign import Campaign
 from campaigns.models.recipient import Recipient
 from common.db.database import get_db
+from common.log.logger import logger
 from users.models.user import User
 
 
@@ -28,21 +33,116 @@ class RecipientService:
 
         return total_count or 0
 
-    async def create_recipient(
+    async def add_recipients(
         self,
         campaign: Campaign,
-        email: EmailStr,
-    ) -> Recipient:
-        recipient = Recipient(
-            email=email,
-            campaign_id=campaign.id,
+        recipients: dict[str, dict[str, str]],
+    ) -> None:
+        if not recipients:
+            return
+
+        # Recipients imported in several pages may repeat, the first one is kept
+        await self._db.execute(
+            pg_insert(Recipient).on_conflict_do_nothing(
+                index_elements=[Recipient.campaign_id, Recipient.email]
+            ),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "email": email,
+                    "fields": fields or None,
+                    "campaign_id": campaign.id,
+                }
+                for email, fields in recipients.items()
+            ],
         )
 
-        self._db.add(recipient)
+    async def create_recipients(
+        self,
+        campaign: Campaign,
+        recipients: dict[str, dict[str, str]],
+    ) -> None:
+        await self.add_recipients(campaign, recipients)
         await self._db.commit()
-        await self._db.refresh(recipient)
 
-        return recipient
+    async def get_recipients_count_for_campaign(self, campaign: Campaign) -> int:
+        result = await self._db.scalar(
+            select(func.count(Recipient.id)).where(Recipient.campaign_id == campaign.id)
+        )
+
+        return result or 0
+
+    async def get_recipient_ids_for_campaign(
+        self, campaign_id: uuid.UUID
+    ) -> list[uuid.UUID]:
+        result = await self._db.scalars(
+            select(Recipient.id)
+            .where(Recipient.campaign_id == campaign_id)
+            .order_by(Recipient.id)
+        )
+
+        return list(result)
+
+    async def get_pending_recipients_by_ids(
+        self, recipient_ids: list[uuid.UUID]
+    ) -> list[Recipient]:
+        result = await self._db.scalars(
+            select(Recipient)
+            .where(Recipient.id.in_(recipient_ids))
+            .where(Recipient.status == RecipientStatus.PENDING)
+            .order_by(Recipient.id)
+        )
+
+        return list(result)
+
+    async def fail_pending_recipients(
+        self, recipient_ids: list[uuid.UUID], error: str
+    ) -> None:
+        if not recipient_ids:
+            return
+
+        await self._db.execute(
+            update(Recipient)
+            .where(Recipient.id.in_(recipient_ids))
+            .where(Recipient.status == RecipientStatus.PENDING)
+            .values(status=RecipientStatus.FAILED, error=error[:255])
+        )
+        await self._db.commit()
+
+    async def update_recipient_statuses(self, updates: list[dict[str, Any]]) -> None:
+        if not updates:
+            return
+
+        await self._db.execute(update(Recipient), updates)
+        await self._db.commit()
+
+    def normalize_recipients(
+        self, recipients: Iterable[dict[str, Any]]
+    ) -> dict[str, dict[str, str]]:
+        normalized_recipients = {}
+
+        for recipient in recipients:
+            email = recipient.get("email")
+
+            try:
+                normalized_email = validate_email(
+                    email.strip(), check_deliverability=False
+                ).normalized.lower()
+            except (EmailNotValidError, AttributeError):
+                logger.warning(f"Skipping invalid recipient email: {email!r}")
+                continue
+
+            # Columns imported next to the email become the template fields
+            normalized_recipients.setdefault(
+                normalized_email,
+                {
+                    str(name): str(value)
+                    for name, value in recipient.items()
+                    if name != "email" and value is not None
+                },
+            )
+
+        return normalized_recipients
 
 
 async def get_recipient_service(
@@ -0,0 +1,113 @@
+import uuid
+from datetime import datetime
+from typing import Annotated
+import pytz
+from fastapi import Depends
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from campaigns.enum.campaign_status import CampaignStatus
+from campaigns.models.campaign import Campaign
+from campaigns.models.scheduled_campaign import ScheduledCampaign
+from common.db.database import get_db
+from users.models.user import User
+
+
+class ScheduledCampaignService:
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def schedule_campaign(
+        self, campaign: Campaign, scheduled_at: datetime
+    ) -> ScheduledCampaign:
+        scheduled_campaign = ScheduledCampaign(
+            campaign_id=campaign.id,
+            scheduled_at=self._to_naive_utc(scheduled_at),
+        )
+        campaign.status = CampaignStatus.SCHEDULED
+
+        self._db.add(scheduled_campaign)
+        await self._db.flush()
+
+        return scheduled_campaign
+
+    async def lock_due_campaigns(self, limit: int) -> list[tuple[uuid.UUID, int]]:
+        # Locked rows are skipped, so concurrent dispatchers never share a campaign
+        result = await self._db.execute(
+            select(ScheduledCampaign.campaign_id, Campaign.version)
+            .join(Campaign, Campaign.id == ScheduledCampaign.campaign_id)
+            .where(
+                ScheduledCampaign.scheduled_at
+                <= datetime.now(pytz.utc).replace(tzinfo=None)
+            )
+            .order_by(ScheduledCampaign.scheduled_at)
+            .limit(limit)
+            .with_for_update(of=ScheduledCampaign, skip_locked=True)
+        )
+
+        return [(campaign_id, version) for campaign_id, version in result]
+
+    async def remove_scheduled_campaigns(self, campaign_ids: list[uuid.UUID]) -> None:
+        await self._db.execute(
+            delete(ScheduledCampaign).where(
+                ScheduledCampaign.campaign_id.in_(campaign_ids)
+            )
+        )
+        await self._db.commit()
+
+    async def cancel_campaign(self, user: User, campaign_id: uuid.UUID) -> bool:
+        # The version bump also voids a dispatch that is already on its way
+        result = await self._db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .where(Campaign.user_id == user.id)
+            .where(Campaign.status == CampaignStatus.SCHEDULED)
+            .values(status=CampaignStatus.CANCELLED, version=Campaign.version + 1)
+            .returning(Campaign.id)
+        )
+
+        if result.scalar_one_or_none() is None:
+            return False
+
+        await self._db.execute(
+            delete(ScheduledCampaign).where(
+                ScheduledCampaign.campaign_id == campaign_id
+            )
+        )
+        await self._db.commit()
+
+        return True
+
+    async def reschedule_campaign(
+        self, user: User, campaign_id: uuid.UUID, scheduled_at: datetime
+    ) -> bool:
+        result = await self._db.execute(
+            update(ScheduledCampaign)
+            .where(ScheduledCampaign.campaign_id == campaign_id)
+            .where(
+                ScheduledCampaign.campaign_id.in_(
+                    select(Campaign.id).where(Campaign.user_id == user.id)
+                )
+            )
+            .values(scheduled_at=self._to_naive_utc(scheduled_at))
+            .returning(ScheduledCampaign.campaign_id)
+        )
+
+        if result.scalar_one_or_none() is None:
+            return False
+
+        await self._db.commit()
+
+        return True
+
+    def _to_naive_utc(self, value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value
+
+        return value.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+async def get_scheduled_campaign_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> ScheduledCampaignService:
+    return ScheduledCampaignService(db=db)
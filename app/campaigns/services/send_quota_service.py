@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+from typing import Annotated
+from fastapi import Depends
+from redis.asyncio import Redis
+
+from common.redis.redis_client import get_redis_client
+
+# Grants as much of the requested block as still fits under the daily limit
+RESERVE_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local granted = math.min(tonumber(ARGV[1]), math.max(tonumber(ARGV[2]) - used, 0))
+
+if granted > 0 then
+    redis.call('INCRBY', KEYS[1], granted)
+
+    if redis.call('TTL', KEYS[1]) < 0 then
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+    end
+end
+
+return granted
+"""
+
+# Returns unused sends without letting the counter drop below zero
+RELEASE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+
+local used = redis.call('DECRBY', KEYS[1], ARGV[1])
+
+if used < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    used = 0
+end
+
+return used
+"""
+
+
+def get_daily_sent_count_key(user_id: int, day: date | None = None) -> str:
+    return f"sent:{user_id}:{day or date.today()}"
+
+
+class SendQuotaReservation:
+    def __init__(self, key: str, granted: int) -> None:
+        self.key = key
+        self.granted = granted
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.granted - self.used
+
+
+class SendQuotaService:
+    def __init__(self, redis_client: Redis) -> None:
+        self._redis_client = redis_client
+        self._reserve_script = redis_client.register_script(RESERVE_SCRIPT)
+        self._release_script = redis_client.register_script(RELEASE_SCRIPT)
+
+    async def reserve(
+        self, user_id: int, limit: int, count: int
+    ) -> SendQuotaReservation:
+        key = get_daily_sent_count_key(user_id)
+
+        granted = await self._reserve_script(
+            keys=[key],
+            args=[count, limit, int(timedelta(days=1).total_seconds())],
+        )
+
+        return SendQuotaReservation(key=key, granted=int(granted))
+
+    async def release(self, reservation: SendQuotaReservation) -> None:
+        if reservation.remaining <= 0:
+            return
+
+        await self._release_script(keys=[reservation.key], args=[reservation.remaining])
+
+        reservation.granted = reservation.used
+
+
+async def get_send_quota_service(
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+) -> SendQuotaService:
+    return SendQuotaService(redis_client=redis_client)
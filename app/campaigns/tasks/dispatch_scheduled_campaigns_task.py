@@ -0,0 +1,43 @@
+import asyncio
+
+from campaigns.config.campaign_config import campaign_settings
+from campaigns.dependencies.campaign_worker_container import (
+    campaign_worker_container,
+)
+from campaigns.tasks.send_emails_task import send_emails_task
+from common.celery.celery_app import celery_app
+from common.celery.worker_event_loop import run_async
+from common.log.logger import logger
+
+
+async def dispatch_scheduled_campaigns() -> int:
+    async with campaign_worker_container() as container:
+        due_campaigns = await container.scheduled_campaign_service.lock_due_campaigns(
+            limit=campaign_settings.SCHEDULED_CAMPAIGN_DISPATCH_BATCH_SIZE
+        )
+
+        if not due_campaigns:
+            return 0
+
+        # Rows are removed only after the sends are queued; a campaign that is
+        # queued twice claims the same version and its chunks are not requeued
+        for campaign_id, version in due_campaigns:
+            await asyncio.to_thread(
+                send_emails_task.apply_async, args=[str(campaign_id), version]
+            )
+
+        await container.scheduled_campaign_service.remove_scheduled_campaigns(
+            [campaign_id for campaign_id, _ in due_campaigns]
+        )
+
+        return len(due_campaigns)
+
+
+@celery_app.task(name="dispatch_scheduled_campaigns_task")
+def dispatch_scheduled_campaigns_task() -> int:
+    dispatched_count = run_async(dispatch_scheduled_campaigns())
+
+    if dispatched_count:
+        logger.info(f"Dispatched {dispatched_count} scheduled campaigns")
+
+    return dispatched_count
@@ -1,83 +1,239 @@
-import time
-from datetime import datetime
+import uuid
+from typing import Any
 
-from campaigns.models.campaign import Campaign
-from campaigns.schemas.create_message import CreateMessage
-from campaigns.services.campaign_service import CampaignService
+from campaigns.config.campaign_config import campaign_settings
+from campaigns.dependencies.campaign_worker_container import (
+    campaign_worker_container,
+)
 from common.celery.celery_app import celery_app
+from common.celery.worker_event_loop import run_async
 from common.log.logger import logger
-from google_integration.gmail.services.gmail_service import GoogleGmailService
-from subscriptions.services.subscription_service import SubscriptionService
-
-
-@celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
-async def send_emails_task(
-    campaign: Campaign,
-    subscription_service: SubscriptionService,
-    campaign_service: CampaignService,
-    google_gmail_service: GoogleGmailService,
-):
-    results = {
-        "total": len(campaign.recipients),
-        "sent": 0,
-        "failed": 0,
-        "errors": [],
-        "message_ids": [],
-    }
 
-    for recipient in campaign.recipients:
-        can_send, remaining = await subscription_service.check_if_user_can_send_emails(
-            campaign.user
+
+async def start_campaign(campaign_id: uuid.UUID, version: int) -> int | None:
+    async with campaign_worker_container() as container:
+        if not await container.campaign_service.claim_campaign_for_sending(
+            campaign_id=campaign_id,
+            version=version,
+        ):
+            return None
+
+        campaign = await container.campaign_service.get_campaign_for_sending(
+            campaign_id
         )
 
-        if not can_send:
-            results["errors"].append(
-                {"recipient": recipient, "error": "Daily limit reached during campaign"}
+        recipient_ids = (
+            await container.recipient_service.get_recipient_ids_for_campaign(
+                campaign_id
             )
-            results["failed"] += 1
-            break
+        )
+        recipient_ids = [str(recipient_id) for recipient_id in recipient_ids]
+
+        chunk_size = campaign_settings.CAMPAIGN_CHUNK_SIZE
+        chunks = [
+            recipient_ids[index : index + chunk_size]
+            for index in range(0, len(recipient_ids), chunk_size)
+        ]
+
+        entitlement = await container.subscription_service.get_user_entitlement(
+            campaign.user
+        )
+
+        await container.campaign_chunk_scheduler.enqueue(
+            user_id=campaign.user_id,
+            campaign_id=campaign_id,
+            chunks=chunks,
+            priority=(
+                entitlement.plan.get_send_priority() if entitlement.is_active else 0
+            ),
+        )
+
+        logger.info(
+            f"Campaign {campaign_id}: {len(recipient_ids)} recipients in {len(chunks)} chunks"
+        )
+
+        return len(chunks)
+
+
+async def send_campaign_chunk(
+    campaign_id: uuid.UUID, recipient_ids: list[uuid.UUID]
+) -> dict[str, Any]:
+    async with campaign_worker_container() as container:
+        campaign = await container.campaign_service.get_campaign_for_sending(
+            campaign_id
+        )
+
+        if campaign is None:
+            raise Exception(f"send_campaign_chunk: Campaign {campaign_id} not found")
+
+        # Recipients already sent or failed by an earlier attempt are skipped
+        recipients = await container.recipient_service.get_pending_recipients_by_ids(
+            recipient_ids
+        )
+
+        return await container.campaign_sender_service.send_campaign(
+            campaign, recipients
+        )
+
+
+async def fail_campaign_chunk(recipient_ids: list[uuid.UUID], error: str) -> None:
+    async with campaign_worker_container() as container:
+        await container.recipient_service.fail_pending_recipients(recipient_ids, error)
+
+
+async def finish_campaign_chunk(campaign_id: uuid.UUID, chunk_id: str) -> bool:
+    async with campaign_worker_container() as container:
+        return await container.campaign_chunk_scheduler.finish(campaign_id, chunk_id)
+
+
+async def release_campaign_chunks() -> list[dict[str, Any]]:
+    async with campaign_worker_container() as container:
+        return await container.campaign_chunk_scheduler.release()
 
+
+async def requeue_campaign_chunks(chunk_ids: list[str]) -> int:
+    async with campaign_worker_container() as container:
+        return await container.campaign_chunk_scheduler.requeue(chunk_ids)
+
+
+async def reclaim_campaign_chunks() -> int:
+    async with campaign_worker_container() as container:
+        return await container.campaign_chunk_scheduler.reclaim_expired()
+
+
+async def complete_campaign(campaign_id: uuid.UUID) -> tuple[int, int]:
+    async with campaign_worker_container() as container:
+        return await container.campaign_service.complete_campaign(campaign_id)
+
+
+def dispatch_campaign_chunks() -> None:
+    # Only released chunks reach the broker, so one large campaign cannot fill
+    # the queue and prefetch buffers ahead of other users
+    chunks = run_async(release_campaign_chunks())
+
+    for index, chunk in enumerate(chunks):
         try:
-            raw_message = await campaign_service.create_message_with_attachment(
-                CreateMessage(
-                    sender_email=campaign.user.email,
-                    sender_name=campaign.user.name,
-                    recipient=recipient,
-                    subject=campaign.subject,
-                    body=campaign.body_template,
-                    attachments=campaign.attachments,
-                    inline_images=None,
+            send_campaign_chunk_task.apply_async(
+                args=[chunk["campaign_id"], chunk["id"], chunk["recipient_ids"]],
+                priority=chunk["priority"],
+            )
+        except Exception:
+            # Chunks that never reached the broker go back to the front of
+            # their queues instead of holding in-flight slots
+            run_async(
+                requeue_campaign_chunks(
+                    [unpublished["id"] for unpublished in chunks[index:]]
                 )
             )
+            raise
+
+
+@celery_app.task(
+    name="send_emails_task",
+    bind=True,
+    max_retries=5,
+    default_retry_delay=30,
+)
+def send_emails_task(self, campaign_id: str, version: int) -> None:
+    # The claim and the enqueue are both safe to repeat, so a retry resumes a
+    # campaign left in sending by a failure in between
+    try:
+        chunks_count = run_async(start_campaign(uuid.UUID(campaign_id), version))
+    except Exception as e:
+        logger.error(f"Campaign {campaign_id}: failed to start: {str(e)}")
+        raise self.retry(exc=e)
+
+    if chunks_count is None:
+        logger.info(
+            f"Campaign {campaign_id} v{version} is outdated or no longer sendable, skipping"
+        )
+        return
+
+    if chunks_count == 0:
+        complete_campaign_task.delay(campaign_id)
+        return
+
+    dispatch_campaign_chunks()
+
+
+# Each chunk is its own task, so a lost worker only re-runs that chunk
+@celery_app.task(
+    name="send_campaign_chunk_task",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def send_campaign_chunk_task(
+    self, campaign_id: str, chunk_id: str, recipient_ids: list[str]
+) -> dict[str, Any]:
+    try:
+        results = run_async(
+            send_campaign_chunk(
+                uuid.UUID(campaign_id),
+                [uuid.UUID(recipient_id) for recipient_id in recipient_ids],
+            )
+        )
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+
+        logger.error(f"Campaign {campaign_id}: chunk failed: {str(e)}")
 
-            response = await google_gmail_service.send_email_via_gmail(
-                user=campaign.user,
-                raw=raw_message,
+        # Recipients the chunk never reached would otherwise stay pending and
+        # be missing from the campaign totals
+        try:
+            run_async(
+                fail_campaign_chunk(
+                    [uuid.UUID(recipient_id) for recipient_id in recipient_ids],
+                    f"Chunk failed: {str(e)}",
+                )
+            )
+        except Exception as fail_error:
+            logger.error(
+                f"Campaign {campaign_id}: failed to mark chunk recipients: {str(fail_error)}"
             )
 
-            await campaign_service.increment_user_sent_count(campaign.user)
+        results = {
+            "total": len(recipient_ids),
+            "sent": 0,
+            "failed": len(recipient_ids),
+            "errors": [{"recipient": None, "error": str(e)}],
+            "message_ids": [],
+        }
+
+    if run_async(finish_campaign_chunk(uuid.UUID(campaign_id), chunk_id)):
+        complete_campaign_task.delay(campaign_id)
+
+    dispatch_campaign_chunks()
 
-            results["sent"] += 1
-            results["message_ids"].append(response.get("id"))
+    return results
 
-            logger.info(f"Email sent to {recipient}. Message ID: {response.get('id')}")
 
-            time.sleep(0.5)
+@celery_app.task(name="release_campaign_chunks_task")
+def release_campaign_chunks_task() -> None:
+    reclaimed_count = run_async(reclaim_campaign_chunks())
+
+    if reclaimed_count:
+        logger.warning(
+            f"Reclaimed {reclaimed_count} campaign chunks with expired leases"
+        )
+
+    dispatch_campaign_chunks()
 
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append({"recipient": recipient, "error": str(e)})
 
-            logger.error(f"Failed to send to {recipient}: {str(e)}")
+@celery_app.task(name="complete_campaign_task")
+def complete_campaign_task(campaign_id: str) -> dict[str, Any]:
+    sent_count, failed_count = run_async(complete_campaign(uuid.UUID(campaign_id)))
 
     logger.info(
-        f"Campaign completed for user {campaign.user}: "
-        f"{results['sent']} sent, {results['failed']} failed"
+        f"Campaign {campaign_id} completed: {sent_count} sent, {failed_count} failed"
     )
 
     return {
-        "status": "completed",
-        "timestamp": datetime.utcnow().isoformat(),
-        "user_id": campaign.user.id,
-        "results": results,
+        "campaign_id": campaign_id,
+        "total": sent_count + failed_count,
+        "sent": sent_count,
+        "failed": failed_count,
     }
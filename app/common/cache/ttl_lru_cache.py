@@ -0,0 +1,54 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLLRUCache(Generic[K, V]):
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._items: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        item = self._items.get(key)
+
+        if item is None:
+            return None
+
+        expires_at, value = item
+
+        if expires_at <= time.monotonic():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+
+        if ttl <= 0:
+            self._items.pop(key, None)
+            return
+
+        self._items[key] = (time.monotonic() + ttl, value)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        item = self._items.pop(key, None)
+
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
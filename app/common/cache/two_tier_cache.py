@@ -0,0 +1,85 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from common.cache.ttl_lru_cache import TTLLRUCache
+from common.log.logger import logger
+from common.redis.redis_client import get_redis_client
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TwoTierCache(ABC, Generic[K, V]):
+    def __init__(
+        self, key_prefix: str, local_max_size: int, local_ttl: float, ttl: int
+    ) -> None:
+        self._key_prefix = key_prefix
+        self._local = TTLLRUCache[K, V](max_size=local_max_size, ttl=local_ttl)
+        self._ttl = ttl
+
+    async def get(self, key: K) -> V | None:
+        value = self._local.get(key)
+
+        if value is not None:
+            return value
+
+        # Redis is only a shared cache, callers fall back to the database
+        try:
+            redis_client = await get_redis_client()
+            value = await self._load(redis_client, self._get_key(key))
+        except RedisError as e:
+            logger.warning(f"{type(self).__name__}:get: Redis is unavailable: {e}")
+            return None
+
+        if value is None:
+            return None
+
+        self._local.set(key, value, ttl=self._get_ttl(value))
+
+        return value
+
+    async def set(self, key: K, value: V) -> None:
+        ttl = self._get_ttl(value)
+
+        if ttl <= 0:
+            return
+
+        self._local.set(key, value, ttl=ttl)
+
+        try:
+            redis_client = await get_redis_client()
+            await self._store(redis_client, self._get_key(key), value, ttl)
+        except RedisError as e:
+            logger.warning(f"{type(self).__name__}:set: Redis is unavailable: {e}")
+
+    async def invalidate(self, key: K) -> None:
+        self._local.pop(key)
+
+        # Invalidation runs after the write is committed, a stale entry then
+        # lives at most until its TTL instead of failing the request
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.delete(self._get_key(key))
+        except RedisError as e:
+            logger.warning(
+                f"{type(self).__name__}:invalidate: Redis is unavailable: {e}"
+            )
+
+    def _get_ttl(self, value: V) -> int:
+        return self._ttl
+
+    def _get_key(self, key: K) -> str:
+        return f"{self._key_prefix}:{key}"
+
+    @abstractmethod
+    async def _load(self, redis_client: Redis, redis_key: str) -> V | None:
+        pass
+
+    @abstractmethod
+    async def _store(
+        self, redis_client: Redis, redis_key: str, value: V, ttl: int
+    ) -> None:
+        pass
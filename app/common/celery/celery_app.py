@@ -1,16 +1,39 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init, worker_process_shutdown
 from kombu import Exchange, Queue
 
+from campaigns.config.campaign_config import campaign_settings
 from common.log.logger import logger
 from common.config.base_config import base_settings
+from common.db.database import configure_worker_engine
+from common.storage.blob_store import blob_store
+from payments.config.payment_config import payment_settings
+from users.config.user_config import user_settings
+from common.celery.worker_event_loop import (
+    init_worker_clients,
+    start_worker_event_loop,
+    stop_worker_event_loop,
+)
 
 
-celery_app = Celery(broker=base_settings.RABBITMQ_URL, backend=base_settings.REDIS_URL)
+celery_app = Celery(
+    broker=base_settings.RABBITMQ_URL,
+    backend=base_settings.REDIS_URL,
+    include=[
+        "campaigns.tasks.send_emails_task",
+        "campaigns.tasks.dispatch_scheduled_campaigns_task",
+        "users.tasks.enrich_user_profiles_task",
+        "payments.tasks.process_payment_webhooks_task",
+    ],
+)
 
 campaigns_exchange = Exchange(name="campaigns", type="direct")
 campaigns_queue = Queue(
-    name="campaigns", exchange=campaigns_exchange, routing_key="campaigns"
+    name="campaigns",
+    exchange=campaigns_exchange,
+    routing_key="campaigns",
+    queue_arguments={"x-max-priority": campaign_settings.CAMPAIGN_MAX_PRIORITY},
 )
 
 subscriptions_exchange = Exchange(name="subscriptions", type="direct")
@@ -20,13 +43,29 @@ subscriptions_queue = Queue(
     routing_key="subscriptions",
 )
 
+users_exchange = Exchange(name="users", type="direct")
+users_queue = Queue(
+    name="users",
+    exchange=users_exchange,
+    routing_key="users",
+)
+
 celery_app.conf.update(
-    task_queues=(campaigns_queue, subscriptions_queue),
+    task_queues=(campaigns_queue, subscriptions_queue, users_queue),
     task_routes={
         "send_emails_task": {"queue": "campaigns"},
+        "send_campaign_chunk_task": {"queue": "campaigns"},
+        "complete_campaign_task": {"queue": "campaigns"},
+        "release_campaign_chunks_task": {"queue": "campaigns"},
+        "dispatch_scheduled_campaigns_task": {"queue": "campaigns"},
+        "enrich_user_profiles_task": {"queue": "users"},
+        "process_payment_webhooks_task": {"queue": "subscriptions"},
         # "update_subscriptions_task": {"queue": "subscriptions"},
     },
     task_track_started=True,
+    # Workers hold one message at a time, so higher priority chunks are not
+    # stuck behind a prefetched backlog
+    worker_prefetch_multiplier=1,
     timezone="UTC",
     enable_utc=True,
     worker_log_format="[%(asctime)s: %(levelname)s] %(message)s",
@@ -35,13 +74,46 @@ celery_app.conf.update(
     task_max_retries=3,
 )
 
-# celery_app.conf.beat_schedule = {
-#     "update-subscriptions": {
-#         "task": "update_subscriptions_task",
-#         "schedule": crontab(hour=9, minute=0),
-#         "options": {"queue": "subscriptions"},
-#     }
-# }
+celery_app.conf.beat_schedule = {
+    "release-campaign-chunks": {
+        "task": "release_campaign_chunks_task",
+        "schedule": campaign_settings.CAMPAIGN_CHUNK_RELEASE_INTERVAL_SECONDS,
+        "options": {"queue": "campaigns"},
+    },
+    "dispatch-scheduled-campaigns": {
+        "task": "dispatch_scheduled_campaigns_task",
+        "schedule": campaign_settings.SCHEDULED_CAMPAIGN_POLL_INTERVAL_SECONDS,
+        "options": {"queue": "campaigns"},
+    },
+    "enrich-user-profiles": {
+        "task": "enrich_user_profiles_task",
+        "schedule": user_settings.PROFILE_ENRICHMENT_INTERVAL_SECONDS,
+        "options": {"queue": "users"},
+    },
+    "process-payment-webhooks": {
+        "task": "process_payment_webhooks_task",
+        "schedule": payment_settings.PAYMENT_WEBHOOK_POLL_INTERVAL_SECONDS,
+        "options": {"queue": "subscriptions"},
+    },
+    # "update-subscriptions": {
+    #     "task": "update_subscriptions_task",
+    #     "schedule": crontab(hour=9, minute=0),
+    #     "options": {"queue": "subscriptions"},
+    # }
+}
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    blob_store.check_available()
+    configure_worker_engine()
+    start_worker_event_loop()
+    init_worker_clients()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    stop_worker_event_loop()
 
 
 @celery_app.task(name="test_connection")
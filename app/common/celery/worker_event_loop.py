@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+from redis.exceptions import RedisError
+
+from common.db.database import close_db_engine
+from common.http.http_client import close_http_client, get_http_client
+from common.log.logger import logger
+from common.redis.redis_client import close_redis_client, get_redis_client
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+
+async def _open_clients() -> None:
+    await get_redis_client()
+    await get_http_client()
+
+
+async def _close_clients() -> None:
+    await close_http_client()
+    await close_redis_client()
+    await close_db_engine()
+
+
+def start_worker_event_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever, name="worker-event-loop", daemon=True
+            )
+            _loop_thread.start()
+
+            logger.info("✅ Worker event loop started")
+
+    return _loop
+
+
+def init_worker_clients() -> None:
+    try:
+        run_async(_open_clients())
+    except (RedisError, OSError) as e:
+        # Clients are created again on first use, so the worker can still start
+        logger.error(f"❌ Failed to create worker clients: {e}")
+
+
+def stop_worker_event_loop() -> None:
+    global _loop, _loop_thread
+
+    with _loop_lock:
+        if _loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close_clients(), _loop).result()
+        finally:
+            _loop.call_soon_threadsafe(_loop.stop)
+            _loop_thread.join()
+            _loop.close()
+
+            _loop = None
+            _loop_thread = None
+
+            logger.info("✅ Worker event loop stopped")
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    # Every task of the process shares one loop, so clients and pools outlive tasks
+    loop = start_worker_event_loop()
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
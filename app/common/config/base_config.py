@@ -10,6 +10,14 @@ class BaseSettings(BasePydanticSettings):
     DB_NAME: str = ""
     DB_PASS: str = ""
     DB_USER: str = ""
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_WORKER_POOL_SIZE: int = 5
+    DB_WORKER_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER_MODE: bool = False
     ENCRYPTION_KEY: str = ""
     SEQ_URL: str = ""
     SEQ_API_KEY: str = ""
@@ -18,6 +26,13 @@ class BaseSettings(BasePydanticSettings):
     REDIS_PORT: int = 6379
     REDIS_USER: str = ""
     REDIS_PASSWORD: str = ""
+    HTTP_TIMEOUT_SECONDS: float = 30
+    HTTP_MAX_CONNECTIONS: int = 200
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30
+    # Must be an absolute path on a persistent volume shared by the API and workers
+    BLOB_STORAGE_PATH: str = "/var/lib/quicksend/blobs"
+    BLOB_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,7 +1,12 @@
+import uuid
 from collections.abc import AsyncGenerator
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from common.config.base_config import base_settings
 
@@ -12,13 +17,35 @@ SQLALCHEMY_DATABASE_URL = (
     f"{base_settings.DB_HOST}:"
     f"{base_settings.DB_PORT}/"
     f"{base_settings.DB_NAME}"
-    f"?async_fallback=True"
 )
 
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    future=True,
-    poolclass=NullPool,
+
+def create_engine(pool_size: int, max_overflow: int) -> AsyncEngine:
+    connect_args = {}
+
+    if base_settings.DB_PGBOUNCER_MODE:
+        # PgBouncer in transaction mode can hand each statement to a different
+        # server connection, so prepared statements must not be cached or reused
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+
+    return create_async_engine(
+        SQLALCHEMY_DATABASE_URL,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=base_settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=base_settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=base_settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
+
+engine = create_engine(
+    pool_size=base_settings.DB_POOL_SIZE,
+    max_overflow=base_settings.DB_MAX_OVERFLOW,
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -30,6 +57,32 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+def configure_worker_engine() -> None:
+    global engine
+
+    engine = create_engine(
+        pool_size=base_settings.DB_WORKER_POOL_SIZE,
+        max_overflow=base_settings.DB_WORKER_MAX_OVERFLOW,
+    )
+
+    AsyncSessionLocal.configure(bind=engine)
+
+
+def get_pool_stats() -> dict[str, int]:
+    pool = engine.pool
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+async def close_db_engine():
+    await engine.dispose()
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
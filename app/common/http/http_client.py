@@ -0,0 +1,36 @@
+import httpx
+
+from common.config.base_config import base_settings
+from common.log.logger import logger
+
+_http_client: httpx.AsyncClient | None = None
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=base_settings.HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=base_settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=base_settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=base_settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+        logger.info("✅ HTTP client created")
+
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+
+    if _http_client:
+        await _http_client.aclose()
+
+        _http_client = None
+
+        logger.info("✅ HTTP client closed")
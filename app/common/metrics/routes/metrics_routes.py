@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+from starlette.responses import JSONResponse
+
+from common.db.database import get_pool_stats
+from users.dependencies.get_current_user import get_current_user
+
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@metrics_router.get("/db-pool")
+async def get_db_pool_metrics() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=get_pool_stats(),
+    )
@@ -0,0 +1,49 @@
+import asyncio
+from redis.asyncio import Redis
+
+# Takes the tokens right away and returns how long the caller has to wait for
+# them, so concurrent callers queue up behind each other instead of retrying
+ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * rate) - requested
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+
+return tostring(math.max(-tokens, 0) / rate)
+"""
+
+
+class RedisTokenBucket:
+    def __init__(
+        self, redis_client: Redis, key: str, rate: float, capacity: float
+    ) -> None:
+        self._key = key
+        self._rate = rate
+        self._capacity = capacity
+        self._acquire_script = redis_client.register_script(ACQUIRE_SCRIPT)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        if tokens > self._capacity:
+            raise ValueError(
+                f"RedisTokenBucket:acquire: Requested {tokens} tokens, capacity is {self._capacity}"
+            )
+
+        wait = float(
+            await self._acquire_script(
+                keys=[self._key], args=[self._rate, self._capacity, tokens]
+            )
+        )
+
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from fastapi import UploadFile
+
+from common.config.base_config import base_settings
+
+
+class BaseBlobStore(ABC):
+    @abstractmethod
+    async def put_upload(self, file: UploadFile) -> tuple[str, int]:
+        pass
+
+    @abstractmethod
+    def open(self, digest: str) -> AbstractContextManager[memoryview]:
+        pass
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        pass
+
+    @abstractmethod
+    def check_available(self) -> None:
+        pass
+
+
+class LocalBlobStore(BaseBlobStore):
+    def __init__(self, root: str, chunk_size: int) -> None:
+        self._root = Path(root)
+        self._chunk_size = chunk_size
+
+    async def put_upload(self, file: UploadFile) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self._root, prefix=".upload-")
+
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := await file.read(self._chunk_size):
+                    digest.update(chunk)
+                    size += len(chunk)
+
+                    await asyncio.to_thread(tmp.write, chunk)
+
+            blob_path = self._get_path(digest.hexdigest())
+
+            # Identical content is already stored under the same digest
+            if blob_path.exists():
+                os.remove(tmp_path)
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, blob_path)
+
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+            raise
+
+        return digest.hexdigest(), size
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[memoryview]:
+        with open(self._get_path(digest), "rb") as blob:
+            if os.fstat(blob.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+
+            with mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def exists(self, digest: str) -> bool:
+        return self._get_path(digest).exists()
+
+    def check_available(self) -> None:
+        # Campaigns keep only digests, a root that is relative or not mounted
+        # would lose every stored attachment on the next redeploy
+        if not self._root.is_absolute():
+            raise RuntimeError(
+                f"LocalBlobStore:check_available: {self._root} is not an absolute path"
+            )
+
+        if not self._root.is_dir():
+            raise RuntimeError(
+                f"LocalBlobStore:check_available: {self._root} does not exist"
+            )
+
+        if not os.access(self._root, os.W_OK):
+            raise RuntimeError(
+                f"LocalBlobStore:check_available: {self._root} is not writable"
+            )
+
+    def _get_path(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest[2:4] / digest
+
+
+blob_store = LocalBlobStore(
+    root=base_settings.BLOB_STORAGE_PATH,
+    chunk_size=base_settings.BLOB_UPLOAD_CHUNK_SIZE,
+)
+
+
+async def get_blob_store() -> BaseBlobStore:
+    return blob_store
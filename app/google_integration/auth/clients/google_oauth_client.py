@@ -0,0 +1,44 @@
+from typing import Any
+import httpx
+
+from google_integration.clients.google_api_error import GoogleApiError
+from google_integration.config.google_config import google_settings
+
+
+class GoogleOAuthClient:
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        self._http_client = http_client
+
+    async def exchange_code(self, code: str, redirect_uri: str) -> dict[str, Any]:
+        response = await self._http_client.post(
+            google_settings.GOOGLE_TOKEN_URL,
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": redirect_uri,
+                "client_id": google_settings.GOOGLE_CLIENT_ID,
+                "client_secret": google_settings.GOOGLE_CLIENT_SECRET,
+            },
+        )
+
+        return self._get_json(response)
+
+    async def get_user_info(self, access_token: str) -> dict[str, Any]:
+        response = await self._http_client.get(
+            google_settings.GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+
+        return self._get_json(response)
+
+    def _get_json(self, response: httpx.Response) -> dict[str, Any]:
+        if not response.is_success:
+            try:
+                error = response.json()
+                message = str(error.get("error_description") or error.get("error"))
+            except (ValueError, AttributeError):
+                message = response.text
+
+            raise GoogleApiError(status_code=response.status_code, message=message)
+
+        return response.json()
@@ -0,0 +1,174 @@
+import asyncio
+import weakref
+from datetime import datetime, timedelta
+from typing import NamedTuple
+import httpx
+from fastapi import HTTPException, status
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from common.cache.ttl_lru_cache import TTLLRUCache
+from common.db.database import AsyncSessionLocal
+from common.http.http_client import get_http_client
+from common.log.logger import logger
+from common.redis.redis_client import get_redis_client
+from google_integration.auth.models.google_token import GoogleToken
+from google_integration.auth.services.google_token_refresh_error import (
+    GoogleTokenRefreshError,
+)
+from google_integration.config.google_config import google_settings
+
+
+class CachedGoogleToken(NamedTuple):
+    access_token: str
+    expires_at: datetime
+
+
+class GoogleTokenManager:
+    def __init__(self, refresh_skew: timedelta, max_size: int, ttl: float) -> None:
+        self._refresh_skew = refresh_skew
+        # Tokens expire from the cache when they stop being fresh
+        self._tokens = TTLLRUCache[int, CachedGoogleToken](max_size=max_size, ttl=ttl)
+        # Locks hold asyncio primitives, so they are scoped to the loop that uses them
+        self._refresh_locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[int, asyncio.Lock]
+        ] = weakref.WeakKeyDictionary()
+
+    async def get_access_token(self, user_id: int) -> str:
+        cached_token = self._tokens.get(user_id)
+
+        if cached_token:
+            return cached_token.access_token
+
+        async with self._get_refresh_lock(user_id):
+            cached_token = self._tokens.get(user_id)
+
+            if cached_token:
+                return cached_token.access_token
+
+            async with AsyncSessionLocal() as db:
+                cached_token = await self._load_token(db, user_id)
+
+            self._tokens.set(
+                user_id,
+                cached_token,
+                ttl=(
+                    cached_token.expires_at - self._refresh_skew - datetime.now()
+                ).total_seconds(),
+            )
+
+            return cached_token.access_token
+
+    def invalidate(self, user_id: int) -> None:
+        self._tokens.pop(user_id)
+
+    async def _load_token(self, db: AsyncSession, user_id: int) -> CachedGoogleToken:
+        google_token = await self._find_token(db, user_id)
+
+        if self._is_fresh(google_token.expires_at):
+            return CachedGoogleToken(google_token.access_token, google_token.expires_at)
+
+        redis_client = await get_redis_client()
+
+        async with redis_client.lock(
+            f"google_token_refresh:{user_id}",
+            timeout=google_settings.GOOGLE_TOKEN_REFRESH_LOCK_TIMEOUT_SECONDS,
+            blocking_timeout=google_settings.GOOGLE_TOKEN_REFRESH_LOCK_WAIT_SECONDS,
+        ):
+            # Another worker may have refreshed the token while we were waiting
+            await db.refresh(google_token)
+
+            if self._is_fresh(google_token.expires_at):
+                return CachedGoogleToken(
+                    google_token.access_token, google_token.expires_at
+                )
+
+            return await self._refresh_token(db, google_token)
+
+    async def _find_token(self, db: AsyncSession, user_id: int) -> GoogleToken:
+        result = await db.execute(
+            select(GoogleToken).where(GoogleToken.user_id == user_id)
+        )
+        google_token = result.scalar_one_or_none()
+
+        if not google_token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Google token not found for user {user_id}",
+            )
+
+        return google_token
+
+    async def _refresh_token(
+        self, db: AsyncSession, google_token: GoogleToken
+    ) -> CachedGoogleToken:
+        if not google_token.refresh_token:
+            raise GoogleTokenRefreshError(
+                google_token.user_id, "Google refresh token is missing"
+            )
+
+        try:
+            http_client = await get_http_client()
+
+            response = await http_client.post(
+                google_settings.GOOGLE_TOKEN_URL,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": google_token.refresh_token,
+                    "client_id": google_settings.GOOGLE_CLIENT_ID,
+                    "client_secret": google_settings.GOOGLE_CLIENT_SECRET,
+                },
+            )
+            response.raise_for_status()
+            new_token_data = response.json()
+
+            google_token.access_token = new_token_data["access_token"]
+            google_token.expires_in = new_token_data["expires_in"]
+            google_token.expires_at = datetime.now() + timedelta(
+                seconds=new_token_data["expires_in"]
+            )
+
+            await db.commit()
+
+            logger.info(f"Google token refreshed for user {google_token.user_id}")
+
+            return CachedGoogleToken(
+                new_token_data["access_token"], google_token.expires_at
+            )
+
+        except httpx.HTTPError as e:
+            await db.rollback()
+
+            raise GoogleTokenRefreshError(google_token.user_id, str(e)) from e
+        except (KeyError, ValueError, SQLAlchemyError) as e:
+            await db.rollback()
+
+            raise GoogleTokenRefreshError(
+                google_token.user_id,
+                f"Unexpected error while refreshing token: {str(e)}",
+            ) from e
+
+    def _get_refresh_lock(self, user_id: int) -> asyncio.Lock:
+        loop_locks = self._refresh_locks.setdefault(asyncio.get_running_loop(), {})
+
+        if user_id not in loop_locks:
+            loop_locks[user_id] = asyncio.Lock()
+
+        return loop_locks[user_id]
+
+    def _is_fresh(self, expires_at: datetime) -> bool:
+        return datetime.now() + self._refresh_skew < expires_at
+
+
+google_token_manager = GoogleTokenManager(
+    refresh_skew=timedelta(
+        seconds=google_settings.GOOGLE_TOKEN_REFRESH_SKEW_SECONDS,
+    ),
+    max_size=google_settings.GOOGLE_TOKEN_CACHE_MAX_SIZE,
+    ttl=google_settings.GOOGLE_TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+async def get_google_token_manager() -> GoogleTokenManager:
+    return google_token_manager
@@ -0,0 +1,5 @@
+class GoogleTokenRefreshError(Exception):
+    def __init__(self, user_id: int, message: str) -> None:
+        super().__init__(f"Google token refresh failed for user {user_id}: {message}")
+        self.user_id = user_id
+        self.message = message
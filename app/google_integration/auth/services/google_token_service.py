@@ -8,6 +8,9 @@ from google_integration.auth.models.google_token import GoogleToken
 from google_integration.auth.schemas.find_or_create_google_token import (
     FindOrCreateGoogleToken,
 )
+from google_integration.auth.services.google_token_manager import (
+    google_token_manager,
+)
 from users.models.user import User
 
 
@@ -43,6 +46,8 @@ class GoogleTokenService:
         await self._db.commit()
         await self._db.refresh(token)
 
+        google_token_manager.invalidate(user_id)
+
         return token
 
     async def find_token_by_user_id(self, user_id: int) -> GoogleToken | None:
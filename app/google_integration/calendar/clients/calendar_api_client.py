@@ -0,0 +1,19 @@
+from typing import Any
+from urllib.parse import quote
+import httpx
+
+from google_integration.clients.google_api_client import GoogleApiClient
+from google_integration.config.google_config import google_settings
+
+
+class CalendarApiClient(GoogleApiClient):
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        super().__init__(
+            http_client=http_client, base_url=google_settings.CALENDAR_API_URL
+        )
+
+    async def get_setting(self, access_token: str, setting: str) -> dict[str, Any]:
+        return await self._get_json(
+            f"/calendar/v3/users/me/settings/{quote(setting, safe='')}",
+            access_token=access_token,
+        )
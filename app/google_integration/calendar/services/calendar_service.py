@@ -1,54 +1,46 @@
-from typing import Any
+from typing import Annotated
+import httpx
 import pytz
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
+from fastapi import Depends
 
+from common.http.http_client import get_http_client
 from common.log.logger import logger
-from google_integration.auth.models.google_token import GoogleToken
-from google_integration.config.google_config import google_settings
+from google_integration.calendar.clients.calendar_api_client import (
+    CalendarApiClient,
+)
+from google_integration.clients.google_api_error import GoogleApiError
 
 
 class GoogleCalendarService:
-    async def _create_credentials(self, google_token: GoogleToken) -> Credentials:
-        return Credentials(
-            token=google_token.access_token,
-            refresh_token=google_token.refresh_token,
-            token_uri=google_settings.GOOGLE_TOKEN_URI,
-            client_id=google_settings.GOOGLE_CLIENT_ID,
-            client_secret=google_settings.GOOGLE_CLIENT_SECRET,
-            scopes=["https://www.googleapis.com/auth/calendar.readonly"],
-        )
-
-    async def get_google_calendar_service(self, google_token: GoogleToken) -> Any:
-        credentials = await self._create_credentials(google_token)
-
-        return build(
-            serviceName="calendar",
-            version="v3",
-            credentials=credentials,
-        )
+    def __init__(self, calendar_api_client: CalendarApiClient) -> None:
+        self._calendar_api_client = calendar_api_client
 
     async def get_user_timezone(
-        self, google_token: GoogleToken
-    ) -> pytz.tzinfo.BaseTzInfo:
+        self, access_token: str
+    ) -> pytz.tzinfo.BaseTzInfo | None:
         try:
-            service = await self.get_google_calendar_service(google_token)
-
-            settings = service.settings().get(setting="timezone").execute()
+            settings = await self._calendar_api_client.get_setting(
+                access_token=access_token, setting="timezone"
+            )
             timezone = settings.get("value")
             if timezone:
                 return pytz.timezone(timezone)
 
-            calendar = service.calendars().get(calendarId="primary").execute()
-            timezone = calendar.get("timeZone")
-            if timezone:
-                return pytz.timezone(timezone)
+        except GoogleApiError as e:
+            # Transient errors are raised, so the caller can try again later
+            if e.is_retryable:
+                raise e
 
+            logger.info(f"Failed to get user timezone: {e}")
         except Exception as e:
             logger.info(f"Failed to get user timezone: {e}")
 
-        return pytz.utc
+        return None
 
 
-async def get_google_calendar_service() -> GoogleCalendarService:
-    return GoogleCalendarService()
+async def get_google_calendar_service(
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+) -> GoogleCalendarService:
+    return GoogleCalendarService(
+        calendar_api_client=CalendarApiClient(http_client=http_client),
+    )
@@ -0,0 +1,70 @@
+import asyncio
+import json
+from typing import Any
+import httpx
+
+from google_integration.clients.google_api_error import GoogleApiError
+from google_integration.config.google_config import google_settings
+
+
+class GoogleApiClient:
+    def __init__(self, http_client: httpx.AsyncClient, base_url: str) -> None:
+        self._http_client = http_client
+        self._base_url = base_url
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        access_token: str,
+        retry: bool = False,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {access_token}", **(headers or {})}
+        max_retries = google_settings.GOOGLE_API_MAX_RETRIES if retry else 0
+
+        for attempt in range(max_retries + 1):
+            if attempt:
+                await asyncio.sleep(
+                    google_settings.GOOGLE_API_RETRY_DELAY_SECONDS * 2 ** (attempt - 1)
+                )
+
+            try:
+                response = await self._http_client.request(
+                    method,
+                    f"{self._base_url}{path}",
+                    headers=headers,
+                    **kwargs,
+                )
+            except httpx.TransportError as e:
+                if attempt < max_retries:
+                    continue
+
+                raise GoogleApiError(status_code=503, message=str(e)) from e
+
+            if response.is_success:
+                return response
+
+            error = self._get_error(response.status_code, response.content)
+
+            if not error.is_retryable or attempt == max_retries:
+                raise error
+
+    async def _get_json(
+        self, path: str, access_token: str, **kwargs: Any
+    ) -> dict[str, Any]:
+        response = await self._request(
+            "GET", path, access_token=access_token, retry=True, **kwargs
+        )
+
+        return response.json()
+
+    def _get_error(self, status_code: int, content: bytes) -> GoogleApiError:
+        try:
+            message = json.loads(content)["error"]["message"]
+        # Bodies that are not a Google error object are reported as they are
+        except (ValueError, KeyError, TypeError):
+            message = content.decode("utf-8", errors="replace")
+
+        return GoogleApiError(status_code=status_code, message=message)
@@ -0,0 +1,12 @@
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GoogleApiError(Exception):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"Google API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+    @property
+    def is_retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
@@ -12,11 +12,31 @@ class GoogleSettings(BaseSettings):
         "profile",
         "https://www.googleapis.com/auth/gmail.send",
         "https://www.googleapis.com/auth/spreadsheets.readonly",
+        "https://www.googleapis.com/auth/drive.metadata.readonly",
+        "https://www.googleapis.com/auth/calendar.settings.readonly",
     ]
     GOOGLE_USERINFO_URL: str = "https://www.googleapis.com/oauth2/v3/userinfo"
     GOOGLE_TOKEN_INFO_URL: str = "https://oauth2.googleapis.com/tokeninfo"
     GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
-    GOOGLE_TOKEN_URI: str = "https://accounts.google.com/o/oauth2/token"
+    GMAIL_API_URL: str = "https://gmail.googleapis.com"
+    SHEETS_API_URL: str = "https://sheets.googleapis.com"
+    DRIVE_API_URL: str = "https://www.googleapis.com"
+    CALENDAR_API_URL: str = "https://www.googleapis.com"
+    GOOGLE_API_MAX_RETRIES: int = 3
+    GOOGLE_API_RETRY_DELAY_SECONDS: float = 0.5
+    GOOGLE_TOKEN_REFRESH_SKEW_SECONDS: int = 300
+    GOOGLE_TOKEN_REFRESH_LOCK_TIMEOUT_SECONDS: float = 30
+    GOOGLE_TOKEN_REFRESH_LOCK_WAIT_SECONDS: float = 15
+    GOOGLE_TOKEN_CACHE_MAX_SIZE: int = 10000
+    GOOGLE_TOKEN_CACHE_TTL_SECONDS: float = 3600
+    GMAIL_BATCH_MAX_SIZE: int = 50
+    GMAIL_BATCH_MAX_RETRIES: int = 3
+    GMAIL_BATCH_RETRY_DELAY_SECONDS: float = 1.0
+    SHEETS_IMPORT_PAGE_ROWS: int = 5000
+    SHEETS_IMPORT_PAGES_PER_REQUEST: int = 4
+    SHEETS_CACHE_MAX_SIZE: int = 256
+    SHEETS_CACHE_TTL_SECONDS: float = 3600
+    SHEETS_REVISION_DENIED_TTL_SECONDS: float = 600
 
     model_config = SettingsConfigDict(
         env_file=".env",
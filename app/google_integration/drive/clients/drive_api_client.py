@@ -0,0 +1,21 @@
+from typing import Any
+import httpx
+
+from google_integration.clients.google_api_client import GoogleApiClient
+from google_integration.config.google_config import google_settings
+
+
+class DriveApiClient(GoogleApiClient):
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        super().__init__(
+            http_client=http_client, base_url=google_settings.DRIVE_API_URL
+        )
+
+    async def get_file(
+        self, access_token: str, file_id: str, fields: str
+    ) -> dict[str, Any]:
+        return await self._get_json(
+            f"/drive/v3/files/{file_id}",
+            access_token=access_token,
+            params={"fields": fields},
+        )
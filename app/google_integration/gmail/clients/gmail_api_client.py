@@ -0,0 +1,83 @@
+import json
+import uuid
+from email.parser import BytesParser
+from typing import Any
+import httpx
+
+from google_integration.clients.google_api_client import GoogleApiClient
+from google_integration.clients.google_api_error import GoogleApiError
+from google_integration.config.google_config import google_settings
+
+
+class GmailApiClient(GoogleApiClient):
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        super().__init__(
+            http_client=http_client, base_url=google_settings.GMAIL_API_URL
+        )
+
+    async def send_message(self, access_token: str, raw: str) -> dict[str, Any]:
+        response = await self._request(
+            "POST",
+            "/gmail/v1/users/me/messages/send",
+            access_token=access_token,
+            json={"raw": raw},
+        )
+
+        return response.json()
+
+    async def send_messages_batch(
+        self, access_token: str, raws: list[str]
+    ) -> list[dict[str, Any] | GoogleApiError]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+
+        parts = []
+        for index, raw in enumerate(raws):
+            parts.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: <item-{index}>\r\n"
+                f"\r\n"
+                f"POST /gmail/v1/users/me/messages/send\r\n"
+                f"Content-Type: application/json\r\n"
+                f"\r\n"
+                f"{json.dumps({'raw': raw})}\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+
+        response = await self._request(
+            "POST",
+            "/batch/gmail/v1",
+            access_token=access_token,
+            content="".join(parts).encode("ascii"),
+            headers={"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+
+        return self._parse_batch_response(response, len(raws))
+
+    def _parse_batch_response(
+        self, response: httpx.Response, size: int
+    ) -> list[dict[str, Any] | GoogleApiError]:
+        results: list[dict[str, Any] | GoogleApiError] = [
+            GoogleApiError(status_code=500, message="No response in batch")
+        ] * size
+
+        multipart = BytesParser().parsebytes(
+            f"Content-Type: {response.headers['Content-Type']}\r\n\r\n".encode()
+            + response.content
+        )
+
+        for part in multipart.get_payload():
+            content_id = part.get("Content-ID", "").strip("<>")
+            index = int(content_id.rsplit("-", 1)[-1])
+
+            http_response = part.get_payload(decode=True)
+            status_line, _, rest = http_response.partition(b"\r\n")
+            _, _, body = rest.partition(b"\r\n\r\n")
+            status_code = int(status_line.split()[1])
+
+            if 200 <= status_code < 300:
+                results[index] = json.loads(body)
+            else:
+                results[index] = self._get_error(status_code, body)
+
+        return results
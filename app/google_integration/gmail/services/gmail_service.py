@@ -1,94 +1,107 @@
 import asyncio
 from typing import Any, Annotated
-from fastapi import HTTPException, status, Depends
-from googleapiclient.discovery import build
-from sqlalchemy.ext.asyncio import AsyncSession
-from google.oauth2.credentials import Credentials
-
-from common.db.database import get_db
-from google_integration.auth.models.google_token import GoogleToken
-from google_integration.auth.services.google_auth_service import (
-    GoogleAuthService,
-    get_google_auth_service,
-)
-from google_integration.auth.services.google_token_service import (
-    GoogleTokenService,
-    get_google_token_service,
+import httpx
+from fastapi import Depends
+
+from common.http.http_client import get_http_client
+from common.log.logger import logger
+from google_integration.auth.services.google_token_manager import (
+    GoogleTokenManager,
+    get_google_token_manager,
 )
+from google_integration.clients.google_api_error import GoogleApiError
 from google_integration.config.google_config import google_settings
+from google_integration.gmail.clients.gmail_api_client import GmailApiClient
 from users.models.user import User
 
 
 class GoogleGmailService:
     def __init__(
         self,
-        db: AsyncSession,
-        google_token_service: GoogleTokenService,
-        google_auth_service: GoogleAuthService,
+        google_token_manager: GoogleTokenManager,
+        gmail_api_client: GmailApiClient,
     ):
-        self._google_token_service = google_token_service
-        self._google_auth_service = google_auth_service
-        self._db = db
-
-    async def _create_credentials(self, google_token: GoogleToken) -> Credentials:
-        return Credentials(
-            token=google_token.access_token,
-            refresh_token=google_token.refresh_token,
-            token_uri=google_settings.GOOGLE_TOKEN_URI,
-            client_id=google_settings.GOOGLE_CLIENT_ID,
-            client_secret=google_settings.GOOGLE_CLIENT_SECRET,
-            scopes=["https://www.googleapis.com/auth/gmail.send"],
-        )
-
-    async def get_google_gmail_service_for_token(
-        self, google_token: GoogleToken
-    ) -> Any:
-        credentials = await self._create_credentials(google_token)
+        self._google_token_manager = google_token_manager
+        self._gmail_api_client = gmail_api_client
 
-        return build(
-            serviceName="gmail",
-            version="v1",
-            credentials=credentials,
-        )
+    async def get_access_token_for_user(self, user: User) -> str:
+        return await self._google_token_manager.get_access_token(user.id)
 
     async def send_email_via_gmail(
         self,
         user: User,
         raw: str,
+        access_token: str | None = None,
     ) -> dict[str, Any]:
-        google_token = await self._google_token_service.get_google_token_for_user(user)
+        if access_token is None:
+            access_token = await self.get_access_token_for_user(user)
+
+        return await self._gmail_api_client.send_message(
+            access_token=access_token,
+            raw=raw,
+        )
 
-        if not google_token:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Google token not found for user {user}",
+    async def send_emails_batch_via_gmail(
+        self,
+        user: User,
+        raws: list[str],
+        access_token: str | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        if len(raws) > google_settings.GMAIL_BATCH_MAX_SIZE:
+            raise ValueError(
+                f"GoogleGmailService:send_emails_batch_via_gmail: Batch of {len(raws)} "
+                f"exceeds {google_settings.GMAIL_BATCH_MAX_SIZE} messages"
             )
 
-        if google_token.is_expired:
-            await self._google_auth_service.refresh_google_token(google_token)
+        if access_token is None:
+            access_token = await self.get_access_token_for_user(user)
+
+        results: list[dict[str, Any] | Exception | None] = [None] * len(raws)
+        pending = list(range(len(raws)))
+
+        for attempt in range(google_settings.GMAIL_BATCH_MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(
+                    google_settings.GMAIL_BATCH_RETRY_DELAY_SECONDS * 2 ** (attempt - 1)
+                )
+
+            # A transport error or 5xx on the batch request itself fails every
+            # pending part, so they are retried the same way as failed parts
+            try:
+                responses = await self._gmail_api_client.send_messages_batch(
+                    access_token=access_token,
+                    raws=[raws[index] for index in pending],
+                )
+            except GoogleApiError as e:
+                responses = [e] * len(pending)
 
-        gmail_service = await self.get_google_gmail_service_for_token(google_token)
+            for index, response in zip(pending, responses):
+                results[index] = response
 
-        return await asyncio.to_thread(
-            lambda: gmail_service.users()
-            .messages()
-            .send(
-                userId="me",
-                body={"raw": raw},
+            pending = [
+                index
+                for index in pending
+                if isinstance(results[index], GoogleApiError)
+                and results[index].is_retryable
+            ]
+
+            if not pending:
+                break
+
+            logger.info(
+                f"Retrying {len(pending)} of {len(raws)} batched Gmail sends for user {user.id}"
             )
-            .execute()
-        )
+
+        return results
 
 
 async def get_google_gmail_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    google_token_service: Annotated[
-        GoogleTokenService, Depends(get_google_token_service)
+    google_token_manager: Annotated[
+        GoogleTokenManager, Depends(get_google_token_manager)
     ],
-    google_auth_service: Annotated[GoogleAuthService, Depends(get_google_auth_service)],
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
 ) -> GoogleGmailService:
     return GoogleGmailService(
-        google_token_service=google_token_service,
-        google_auth_service=google_auth_service,
-        db=db,
+        google_token_manager=google_token_manager,
+        gmail_api_client=GmailApiClient(http_client=http_client),
     )
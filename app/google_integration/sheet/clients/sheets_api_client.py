@@ -0,0 +1,34 @@
+from typing import Any
+import httpx
+
+from google_integration.clients.google_api_client import GoogleApiClient
+from google_integration.config.google_config import google_settings
+
+
+class SheetsApiClient(GoogleApiClient):
+    def __init__(self, http_client: httpx.AsyncClient) -> None:
+        super().__init__(
+            http_client=http_client, base_url=google_settings.SHEETS_API_URL
+        )
+
+    async def get_spreadsheet(
+        self, access_token: str, spreadsheet_id: str, fields: str | None = None
+    ) -> dict[str, Any]:
+        params = {"fields": fields} if fields else None
+
+        return await self._get_json(
+            f"/v4/spreadsheets/{spreadsheet_id}",
+            access_token=access_token,
+            params=params,
+        )
+
+    async def batch_get_values(
+        self, access_token: str, spreadsheet_id: str, ranges: list[str]
+    ) -> list[dict[str, Any]]:
+        result = await self._get_json(
+            f"/v4/spreadsheets/{spreadsheet_id}/values:batchGet",
+            access_token=access_token,
+            params=[("ranges", range) for range in ranges],
+        )
+
+        return result.get("valueRanges", [])
@@ -1,72 +1,167 @@
-from typing import Any
-from fastapi import HTTPException
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
+import re
+from collections.abc import AsyncIterator
+from typing import Any, Annotated
+import httpx
+from fastapi import HTTPException, Depends
 from starlette import status
 
-from google_integration.auth.models.google_token import GoogleToken
+from common.http.http_client import get_http_client
+from common.log.logger import logger
+from google_integration.clients.google_api_error import GoogleApiError
 from google_integration.config.google_config import google_settings
+from google_integration.drive.clients.drive_api_client import DriveApiClient
+from google_integration.sheet.clients.sheets_api_client import SheetsApiClient
+from google_integration.sheet.services.spreadsheet_cache import (
+    SpreadsheetCache,
+    spreadsheet_cache,
+)
+
+A1_CELLS_PATTERN = r"([A-Za-z]{0,3})(\d*)(?::([A-Za-z]{0,3})(\d*))?"
 
 
 class GoogleSheetsService:
-    async def _create_credentials(self, google_token: GoogleToken) -> Credentials:
-        return Credentials(
-            token=google_token.access_token,
-            refresh_token=google_token.refresh_token,
-            token_uri=google_settings.GOOGLE_TOKEN_URI,
-            client_id=google_settings.GOOGLE_CLIENT_ID,
-            client_secret=google_settings.GOOGLE_CLIENT_SECRET,
-            scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"],
-        )
+    def __init__(
+        self,
+        sheets_api_client: SheetsApiClient,
+        drive_api_client: DriveApiClient,
+        spreadsheet_cache: SpreadsheetCache,
+    ) -> None:
+        self._sheets_api_client = sheets_api_client
+        self._drive_api_client = drive_api_client
+        self._spreadsheet_cache = spreadsheet_cache
 
-    async def get_google_sheets_service(self, google_token: GoogleToken) -> Any:
-        credentials = await self._create_credentials(google_token)
+    async def get_spreadsheet_revision(
+        self, spreadsheet_id: str, access_token: str, user_id: int
+    ) -> str | None:
+        # Tokens granted before the Drive scope was requested get a 403 until the
+        # user signs in again, their reads skip the cache without asking Drive
+        if self._spreadsheet_cache.is_revision_denied(user_id):
+            return None
 
-        return build(
-            serviceName="sheets",
-            version="v4",
-            credentials=credentials,
-        )
+        try:
+            file = await self._drive_api_client.get_file(
+                access_token=access_token,
+                file_id=spreadsheet_id,
+                fields="version",
+            )
+        except GoogleApiError as e:
+            if e.status_code == status.HTTP_403_FORBIDDEN:
+                logger.warning(
+                    f"User {user_id} must sign in again to grant the Drive metadata "
+                    f"scope, spreadsheet reads are not cached: {str(e)}"
+                )
+                self._spreadsheet_cache.set_revision_denied(user_id)
+            else:
+                logger.warning(
+                    f"Revision of spreadsheet {spreadsheet_id} is unavailable: {str(e)}"
+                )
+
+            return None
+
+        return file.get("version")
+
+    async def iter_spreadsheet_rows(
+        self,
+        spreadsheet_id: str,
+        range: str,
+        access_token: str,
+    ) -> AsyncIterator[list[dict[str, str]]]:
+        sheet, first_column, start_row, last_column, end_row = self._parse_range(range)
+        page_rows = google_settings.SHEETS_IMPORT_PAGE_ROWS
+
+        header: list[str] | None = None
+
+        # Rows are fetched a few pages per batchGet and handed out page by page,
+        # so only one page of values is held in memory at a time
+        while True:
+            page_ranges = self._build_page_ranges(
+                sheet, first_column, last_column, start_row, end_row
+            )
+
+            if not page_ranges:
+                return
+
+            value_ranges = await self._sheets_api_client.batch_get_values(
+                access_token=access_token,
+                spreadsheet_id=spreadsheet_id,
+                ranges=page_ranges,
+            )
+
+            is_empty_batch = True
+
+            for value_range in value_ranges:
+                rows = value_range.get("values", [])
+
+                if not rows:
+                    continue
+
+                is_empty_batch = False
+
+                if header is None:
+                    header, rows = self._read_header(rows)
+
+                yield [
+                    {
+                        name: cell.strip()
+                        for name, cell in zip(header, row)
+                        if name and cell.strip()
+                    }
+                    for row in rows
+                    if row
+                ]
+
+            # Trailing empty rows are left out of every page, so a short page may
+            # just precede blank rows. A range without an end row is finished
+            # only when a whole batch comes back empty
+            if end_row is None and is_empty_batch:
+                return
+
+            start_row += page_rows * len(page_ranges)
 
     async def parse_emails_from_spreadsheet(
         self,
         spreadsheet_id: str,
         range: str,
-        google_token: GoogleToken,
-    ) -> set[str]:
+        access_token: str,
+        user_id: int,
+    ) -> frozenset[str]:
         try:
-            sheets_service = await self.get_google_sheets_service(google_token)
-            spreadsheet_base = await sheets_service.spreadsheets().values()
-
-            spreadsheet = spreadsheet_base.get(spreadsheetId=spreadsheet_id).execute()
+            # The revision is a cheap metadata call that proves the user can
+            # still read the spreadsheet and tells whether it has changed
+            revision = await self.get_spreadsheet_revision(
+                spreadsheet_id, access_token, user_id
+            )
+            cache_key = ("emails", spreadsheet_id, range)
 
-            if not spreadsheet:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"No such spreadsheet found {spreadsheet_id}",
-                )
+            if revision is not None:
+                emails = self._spreadsheet_cache.get(cache_key, revision)
 
-            result = spreadsheet_base.get(
-                spreadsheetId=spreadsheet_id, range=range
-            ).execute()
+                if emails is not None:
+                    return emails
 
-            values = result.get("values", [])
+            emails = set()
 
-            if not values:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"No data for spreadsheet {spreadsheet_id}",
+            async for rows in self.iter_spreadsheet_rows(
+                spreadsheet_id=spreadsheet_id,
+                range=range,
+                access_token=access_token,
+            ):
+                emails.update(
+                    row["email"] for row in rows if "@" in row.get("email", "")
                 )
 
-            emails = [item[0] for item in values if item and "@" in item[0]]
-
             if not emails:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"No valid emails found in spreadsheet {spreadsheet_id}",
                 )
 
-            return set(emails)
+            emails = frozenset(emails)
+
+            if revision is not None:
+                self._spreadsheet_cache.set(cache_key, revision, emails)
+
+            return emails
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -78,13 +173,26 @@ class GoogleSheetsService:
     async def get_spreadsheet_metadata(
         self,
         spreadsheet_id: str,
-        google_token: GoogleToken,
+        access_token: str,
+        user_id: int,
     ) -> dict[str, Any]:
         try:
-            sheets_service = await self.get_google_sheets_service(google_token)
-            spreadsheet_base = await sheets_service.spreadsheets()
+            revision = await self.get_spreadsheet_revision(
+                spreadsheet_id, access_token, user_id
+            )
+            cache_key = ("metadata", spreadsheet_id)
+
+            if revision is not None:
+                metadata = self._spreadsheet_cache.get(cache_key, revision)
 
-            spreadsheet = spreadsheet_base.get(spreadsheetId=spreadsheet_id).execute()
+                if metadata is not None:
+                    return metadata
+
+            spreadsheet = await self._sheets_api_client.get_spreadsheet(
+                access_token=access_token,
+                spreadsheet_id=spreadsheet_id,
+                fields="properties.title,sheets.properties(title,sheetId)",
+            )
 
             sheets = spreadsheet.get("sheets", [])
 
@@ -102,17 +210,116 @@ class GoogleSheetsService:
                 for sheet in sheets
             ]
 
-            return {
+            metadata = {
                 "spreadsheetName": spreadsheet["properties"]["title"],
                 "sheets": sheet_names,
             }
 
+            if revision is not None:
+                self._spreadsheet_cache.set(cache_key, revision, metadata)
+
+            return metadata
+
+        except HTTPException as e:
+            raise e
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Some problems while processing spreadsheet {spreadsheet_id}: {str(e)}",
             )
 
+    def _parse_range(self, range: str) -> tuple[str | None, str, int, str, int | None]:
+        if "!" in range:
+            sheet, _, cells = range.rpartition("!")
+        elif re.fullmatch(A1_CELLS_PATTERN, range.strip()) and re.search(
+            r"[\d:]", range
+        ):
+            sheet, cells = None, range
+        else:
+            # A bare name without cells selects the whole sheet
+            sheet, cells = range, ""
+
+        if sheet and len(sheet) > 1 and sheet.startswith("'") and sheet.endswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+
+        match = re.fullmatch(A1_CELLS_PATTERN, cells.strip())
+
+        if match is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid range {range}",
+            )
+
+        first_column, first_row, last_column, last_row = match.groups()
+
+        # A single cell is both the start and the end of the range
+        if match.group(3) is None and match.group(4) is None:
+            last_column, last_row = first_column, first_row
+
+        return (
+            sheet,
+            first_column.upper(),
+            int(first_row) if first_row else 1,
+            last_column.upper(),
+            int(last_row) if last_row else None,
+        )
+
+    def _build_page_ranges(
+        self,
+        sheet: str | None,
+        first_column: str,
+        last_column: str,
+        start_row: int,
+        end_row: int | None,
+    ) -> list[str]:
+        page_rows = google_settings.SHEETS_IMPORT_PAGE_ROWS
+        last_row = (
+            start_row + page_rows * google_settings.SHEETS_IMPORT_PAGES_PER_REQUEST - 1
+        )
+
+        if end_row is not None:
+            last_row = min(last_row, end_row)
+
+        # Without a sheet name the API reads the first sheet
+        prefix = ""
+
+        if sheet:
+            sheet = sheet.replace("'", "''")
+            prefix = f"'{sheet}'!"
+
+        return [
+            f"{prefix}{first_column}{page_start}:{last_column}"
+            f"{min(page_start + page_rows - 1, last_row)}"
+            for page_start in range(start_row, last_row + 1, page_rows)
+        ]
+
+    def _read_header(self, rows: list[list[str]]) -> tuple[list[str], list[list[str]]]:
+        first_row = [cell.strip() for cell in rows[0]]
+
+        if not first_row:
+            return ["email"], rows[1:]
+
+        # Without a header row the first row is already data
+        if any("@" in cell for cell in first_row):
+            header = [f"column_{index + 1}" for index in range(len(first_row))]
+            header[next(i for i, cell in enumerate(first_row) if "@" in cell)] = "email"
+
+            return header, rows
+
+        header = [re.sub(r"\W+", "_", cell.lower()).strip("_") for cell in first_row]
+        email_index = next(
+            (index for index, name in enumerate(header) if "mail" in name), 0
+        )
+        header[email_index] = "email"
+
+        return header, rows[1:]
+
 
-async def get_google_sheets_service() -> GoogleSheetsService:
-    return GoogleSheetsService()
+async def get_google_sheets_service(
+    http_client: Annotated[httpx.AsyncClient, Depends(get_http_client)],
+) -> GoogleSheetsService:
+    return GoogleSheetsService(
+        sheets_api_client=SheetsApiClient(http_client=http_client),
+        drive_api_client=DriveApiClient(http_client=http_client),
+        spreadsheet_cache=spreadsheet_cache,
+    )
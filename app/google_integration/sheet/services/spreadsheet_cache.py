@@ -0,0 +1,45 @@
+from typing import Any
+
+from common.cache.ttl_lru_cache import TTLLRUCache
+from google_integration.config.google_config import google_settings
+
+
+class SpreadsheetCache:
+    def __init__(self, max_size: int, ttl: float, denied_ttl: float) -> None:
+        self._items = TTLLRUCache[tuple[str, ...], tuple[str, Any]](
+            max_size=max_size, ttl=ttl
+        )
+        self._revision_denied_users = TTLLRUCache[int, bool](
+            max_size=max_size, ttl=denied_ttl
+        )
+
+    def get(self, key: tuple[str, ...], revision: str) -> Any | None:
+        item = self._items.get(key)
+
+        if item is None:
+            return None
+
+        cached_revision, value = item
+
+        # Any edit of the spreadsheet bumps its revision and voids the entry
+        if cached_revision != revision:
+            self._items.pop(key)
+            return None
+
+        return value
+
+    def set(self, key: tuple[str, ...], revision: str, value: Any) -> None:
+        self._items.set(key, (revision, value))
+
+    def is_revision_denied(self, user_id: int) -> bool:
+        return self._revision_denied_users.get(user_id) is not None
+
+    def set_revision_denied(self, user_id: int) -> None:
+        self._revision_denied_users.set(user_id, True)
+
+
+spreadsheet_cache = SpreadsheetCache(
+    max_size=google_settings.SHEETS_CACHE_MAX_SIZE,
+    ttl=google_settings.SHEETS_CACHE_TTL_SECONDS,
+    denied_ttl=google_settings.SHEETS_REVISION_DENIED_TTL_SECONDS,
+)
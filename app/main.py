@@ -9,18 +9,26 @@ from google_integration.auth.routes.google_auth_routes import google_auth_router
 from google_integration.sheet.routes.sheet_router import google_sheets_router
 from users.routes.jwt_routes import jwt_router
 from subscriptions.routes.subscription_routes import subscription_router
+from payments.routes.payment_webhook_routes import payment_webhook_router
 from campaigns.routes.campaign_routes import campaign_router
+from common.metrics.routes.metrics_routes import metrics_router
 from common.log.logger import logger
 from common.config.base_config import base_settings
 from common.redis.redis_client import close_redis_client
+from common.http.http_client import close_http_client
+from common.db.database import close_db_engine
+from common.storage.blob_store import blob_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    blob_store.check_available()
     logger.info("✅ App started")
     yield
     logger.info("❌ App ended")
     await close_redis_client()
+    await close_http_client()
+    await close_db_engine()
 
 
 app = FastAPI(title="QuickSend", lifespan=lifespan)
@@ -69,8 +77,10 @@ api_router = APIRouter(prefix="/api", tags=["Api"])
 api_router.include_router(google_auth_router)
 api_router.include_router(jwt_router)
 api_router.include_router(subscription_router)
+api_router.include_router(payment_webhook_router)
 api_router.include_router(google_sheets_router)
 api_router.include_router(campaign_router)
+api_router.include_router(metrics_router)
 
 app.include_router(api_router)
 
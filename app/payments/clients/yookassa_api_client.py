@@ -0,0 +1,109 @@
+import asyncio
+import json
+from typing import Any
+import httpx
+
+from common.http.http_client import get_http_client
+from payments.clients.yookassa_api_error import YookassaApiError
+from payments.config.payment_config import payment_settings
+
+
+class YookassaApiClient:
+    def __init__(self, base_url: str, shop_id: str, secret_key: str) -> None:
+        self._base_url = base_url
+        self._auth = httpx.BasicAuth(shop_id, secret_key)
+
+    async def create_payment(
+        self, payload: dict[str, Any], idempotence_key: str
+    ) -> dict[str, Any]:
+        return await self._request(
+            "POST", "/payments", json=payload, idempotence_key=idempotence_key
+        )
+
+    async def get_payment(self, payment_id: str) -> dict[str, Any]:
+        return await self._request("GET", f"/payments/{payment_id}")
+
+    async def cancel_payment(
+        self, payment_id: str, idempotence_key: str
+    ) -> dict[str, Any]:
+        return await self._request(
+            "POST",
+            f"/payments/{payment_id}/cancel",
+            json={},
+            idempotence_key=idempotence_key,
+        )
+
+    async def create_refund(
+        self, payload: dict[str, Any], idempotence_key: str
+    ) -> dict[str, Any]:
+        return await self._request(
+            "POST", "/refunds", json=payload, idempotence_key=idempotence_key
+        )
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        idempotence_key: str | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        # Every retry reuses the idempotence key, so YooKassa applies the
+        # operation at most once even if an earlier attempt did reach it
+        headers = {"Idempotence-Key": idempotence_key} if idempotence_key else {}
+        max_retries = payment_settings.YOOKASSA_MAX_RETRIES
+        http_client = await get_http_client()
+
+        for attempt in range(max_retries + 1):
+            try:
+                response = await http_client.request(
+                    method,
+                    f"{self._base_url}{path}",
+                    auth=self._auth,
+                    headers=headers,
+                    **kwargs,
+                )
+            except httpx.TransportError as e:
+                if attempt < max_retries:
+                    await asyncio.sleep(self._get_retry_delay(attempt))
+                    continue
+
+                raise YookassaApiError(status_code=503, message=str(e)) from e
+
+            # A request that is still being processed is answered with 202 and
+            # has to be repeated with the same key to get the result
+            if response.status_code == 202:
+                error = self._get_error(response.status_code, response.content)
+
+                if attempt == max_retries:
+                    raise error
+
+                await asyncio.sleep(self._get_retry_after(response, attempt))
+                continue
+
+            if response.is_success:
+                return response.json()
+
+            error = self._get_error(response.status_code, response.content)
+
+            if not error.is_retryable or attempt == max_retries:
+                raise error
+
+            await asyncio.sleep(self._get_retry_delay(attempt))
+
+    def _get_retry_after(self, response: httpx.Response, attempt: int) -> float:
+        try:
+            return response.json()["retry_after"] / 1000
+        except (ValueError, KeyError, TypeError):
+            return self._get_retry_delay(attempt)
+
+    def _get_retry_delay(self, attempt: int) -> float:
+        return payment_settings.YOOKASSA_RETRY_DELAY_SECONDS * 2**attempt
+
+    def _get_error(self, status_code: int, content: bytes) -> YookassaApiError:
+        try:
+            error = json.loads(content)
+            message = error.get("description") or error.get("code") or str(error)
+        except (ValueError, AttributeError):
+            message = content.decode("utf-8", errors="replace")
+
+        return YookassaApiError(status_code=status_code, message=message)
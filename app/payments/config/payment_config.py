@@ -3,8 +3,27 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class PaymentSettings(BaseSettings):
     YOOKASSA_SHOP_ID: str = ""
-    YOOKASSA_API_KEY: str = ""
+    YOOKASSA_SECRET_KEY: str = ""
+    YOOKASSA_API_URL: str = "https://api.yookassa.ru/v3"
+    YOOKASSA_MAX_RETRIES: int = 3
+    YOOKASSA_RETRY_DELAY_SECONDS: float = 1.0
     PAYMENT_RETURN_URL: str = ""
+    PAYMENT_WEBHOOK_BATCH_SIZE: int = 100
+    PAYMENT_WEBHOOK_CONCURRENCY: int = 10
+    PAYMENT_WEBHOOK_MAX_ATTEMPTS: int = 10
+    PAYMENT_WEBHOOK_POLL_INTERVAL_SECONDS: float = 5
+    # Proxies whose X-Real-IP header is trusted as the webhook sender address
+    PAYMENT_WEBHOOK_TRUSTED_PROXIES: list[str] = []
+    # Published by YooKassa at https://yookassa.ru/developers/using-api/webhooks
+    YOOKASSA_WEBHOOK_NETWORKS: list[str] = [
+        "185.71.76.0/27",
+        "185.71.77.0/27",
+        "77.75.153.0/25",
+        "77.75.156.11/32",
+        "77.75.156.35/32",
+        "77.75.154.128/25",
+        "2a02:5180::/32",
+    ]
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -40,4 +40,8 @@ class Payment(Base):
     payment_metadata = Column(JSON, nullable=True)
 
     user = relationship(argument="User", back_populates="payments")
-    subscription = relationship(argument="Subscription", back_populates="payments")
+    subscription = relationship(
+        argument="Subscription",
+        back_populates="payments",
+        foreign_keys="Payment.subscription_id",
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Enum,
+    JSON,
+    DateTime,
+    UniqueConstraint,
+)
+
+from common.db.database import Base
+from payments.enum.provider import PaymentProvider as PaymentProviderEnum
+
+
+class PaymentWebhookEvent(Base):
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider",
+            "external_payment_id",
+            "event",
+            name="uq_payment_webhook_events_payment_event",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    provider = Column(Enum(PaymentProviderEnum), nullable=False)
+    external_payment_id = Column(String(100), nullable=False)
+    event = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    received_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True, index=True)
@@ -0,0 +1,58 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from common.log.logger import logger
+from payments.config.payment_config import payment_settings
+from payments.enum.provider import PaymentProvider
+from payments.services.payment_webhook_error import PaymentWebhookError
+from payments.services.payment_webhook_service import (
+    PaymentWebhookService,
+    get_payment_webhook_service,
+)
+from payments.services.provider_factory import (
+    PaymentProviderFactory,
+    get_payment_provider_factory,
+)
+
+payment_webhook_router = APIRouter(prefix="/payments/webhooks", tags=["payments"])
+
+
+def get_sender_ip(request: Request) -> str:
+    peer_ip = request.client.host if request.client else ""
+
+    # Behind the proxy the peer is the proxy itself, the sender is forwarded
+    if peer_ip in payment_settings.PAYMENT_WEBHOOK_TRUSTED_PROXIES:
+        return request.headers.get("X-Real-IP", peer_ip)
+
+    return peer_ip
+
+
+@payment_webhook_router.post(path="/{provider}")
+async def receive_payment_webhook(
+    provider: PaymentProvider,
+    request: Request,
+    payment_provider_factory: Annotated[
+        PaymentProviderFactory, Depends(get_payment_provider_factory)
+    ],
+    payment_webhook_service: Annotated[
+        PaymentWebhookService, Depends(get_payment_webhook_service)
+    ],
+) -> Response:
+    try:
+        data = await request.json()
+        payment_status = await payment_provider_factory.create(provider).verify_webhook(
+            data, get_sender_ip(request)
+        )
+    except (ValueError, PaymentWebhookError) as e:
+        logger.warning(f"Rejected {provider.value} payment webhook: {str(e)}")
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid webhook notification",
+        )
+
+    # State changes are applied by process_payment_webhooks_task, the provider
+    # only needs to know the notification is stored
+    await payment_webhook_service.add_event(provider, payment_status, data)
+
+    return Response(status_code=status.HTTP_200_OK)
@@ -6,10 +6,11 @@ from payments.enum.currency import Currency as CurrencyEnum
 from payments.enum.provider import PaymentProvider as PaymentProviderEnum
 from subscriptions.models.subscription import Subscription
 from users.models.user import User
+from users.schemas.user_snapshot import UserSnapshot
 
 
 class CreatePayment(BaseModel):
-    user: User
+    user: User | UserSnapshot
     subscription: Subscription
     external_payment_id: str
     provider: PaymentProviderEnum
@@ -38,7 +38,9 @@ class BasePaymentProvider(ABC):
         pass
 
     @abstractmethod
-    async def verify_webhook(self, data: Dict[str, Any]) -> PaymentStatus:
+    async def verify_webhook(
+        self, data: Dict[str, Any], sender_ip: str
+    ) -> PaymentStatus:
         pass
 
     @abstractmethod
@@ -0,0 +1,4 @@
+class PaymentWebhookError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Invalid payment webhook: {message}")
+        self.message = message
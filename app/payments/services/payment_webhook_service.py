@@ -0,0 +1,236 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Annotated, Any
+from fastapi import Depends
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from common.db.database import get_db
+from common.log.logger import logger
+from payments.clients.yookassa_api_error import YookassaApiError
+from payments.config.payment_config import payment_settings
+from payments.enum.payment_status import PaymentStatus as PaymentStatusEnum
+from payments.enum.provider import PaymentProvider
+from payments.models.payment import Payment
+from payments.models.payment_webhook_event import PaymentWebhookEvent
+from payments.schemas.base.payment_status import PaymentStatus
+from payments.services.provider_factory import (
+    PaymentProviderFactory,
+    get_payment_provider_factory,
+)
+from subscriptions.services.subscription_entitlement_cache import (
+    subscription_entitlement_cache,
+)
+from users.services.user_identity_cache import user_identity_cache
+
+PAYMENT_STATUS_MAP = {
+    "pending": PaymentStatusEnum.PENDING,
+    "waiting_for_capture": PaymentStatusEnum.PENDING,
+    "succeeded": PaymentStatusEnum.SUCCESS,
+    "canceled": PaymentStatusEnum.CANCELED,
+}
+
+FINAL_PAYMENT_STATUSES = {
+    PaymentStatusEnum.SUCCESS,
+    PaymentStatusEnum.FAILED,
+    PaymentStatusEnum.CANCELED,
+}
+
+
+class PaymentWebhookService:
+    def __init__(
+        self,
+        db: AsyncSession,
+        payment_provider_factory: PaymentProviderFactory,
+    ) -> None:
+        self._db = db
+        self._payment_provider_factory = payment_provider_factory
+
+    async def add_event(
+        self,
+        provider: PaymentProvider,
+        payment_status: PaymentStatus,
+        payload: dict[str, Any],
+    ) -> bool:
+        # Redelivered notifications hit the unique constraint and are dropped
+        result = await self._db.execute(
+            pg_insert(PaymentWebhookEvent)
+            .values(
+                provider=provider,
+                external_payment_id=payment_status.payment_id,
+                event=payment_status.status,
+                payload=payload,
+                attempts=0,
+                received_at=datetime.now(UTC).replace(tzinfo=None),
+            )
+            .on_conflict_do_nothing(
+                constraint="uq_payment_webhook_events_payment_event"
+            )
+            .returning(PaymentWebhookEvent.id)
+        )
+        await self._db.commit()
+
+        return result.scalar_one_or_none() is not None
+
+    async def process_pending_events(self, limit: int) -> int:
+        # Locked rows are skipped, so concurrent workers never share an event
+        result = await self._db.execute(
+            select(PaymentWebhookEvent)
+            .where(PaymentWebhookEvent.processed_at.is_(None))
+            .order_by(PaymentWebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        events = result.scalars().all()
+
+        if not events:
+            return 0
+
+        # Notifications are not trusted as is, the status of every payment is
+        # read back from the provider once per batch
+        payment_keys = list(
+            {(event.provider, event.external_payment_id) for event in events}
+        )
+        payment_statuses = await self._get_verified_payment_statuses(payment_keys)
+
+        payments = await self._get_payments(list(payment_statuses))
+        applied_payment_keys = set()
+        user_ids = set()
+
+        for payment in payments:
+            payment_key = (payment.provider, payment.external_payment_id)
+            applied_payment_keys.add(payment_key)
+
+            if self._apply_payment_status(payment, payment_statuses[payment_key]):
+                user_ids.add(payment.user_id)
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        processed_count = 0
+
+        # An event is done only once its payment was found, a notification that
+        # arrives before the payment is stored is retried like a failed check
+        for event in events:
+            if (event.provider, event.external_payment_id) in applied_payment_keys:
+                event.processed_at = now
+                processed_count += 1
+                continue
+
+            event.attempts += 1
+
+            if event.attempts >= payment_settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS:
+                logger.error(
+                    f"Giving up on webhook event {event.id} for payment {event.external_payment_id}"
+                )
+
+                event.processed_at = now
+
+        await self._db.commit()
+
+        for user_id in user_ids:
+            await subscription_entitlement_cache.invalidate(user_id)
+            await user_identity_cache.invalidate(user_id)
+
+        return processed_count
+
+    async def _get_verified_payment_statuses(
+        self, payment_keys: list[tuple[PaymentProvider, str]]
+    ) -> dict[tuple[PaymentProvider, str], PaymentStatus]:
+        semaphore = asyncio.Semaphore(payment_settings.PAYMENT_WEBHOOK_CONCURRENCY)
+
+        async def get_payment_status(
+            provider: PaymentProvider, external_payment_id: str
+        ) -> PaymentStatus | None:
+            async with semaphore:
+                try:
+                    payment_provider = self._payment_provider_factory.create(provider)
+
+                    return await payment_provider.get_payment_status(
+                        external_payment_id
+                    )
+                except (YookassaApiError, KeyError, ValueError) as e:
+                    logger.warning(
+                        f"Failed to verify payment {external_payment_id}: {str(e)}"
+                    )
+
+                    return None
+
+        payment_statuses = await asyncio.gather(
+            *(get_payment_status(*payment_key) for payment_key in payment_keys)
+        )
+
+        return {
+            payment_key: payment_status
+            for payment_key, payment_status in zip(payment_keys, payment_statuses)
+            if payment_status is not None
+        }
+
+    async def _get_payments(
+        self, payment_keys: list[tuple[PaymentProvider, str]]
+    ) -> list[Payment]:
+        if not payment_keys:
+            return []
+
+        result = await self._db.execute(
+            select(Payment)
+            .options(selectinload(Payment.subscription))
+            .where(
+                tuple_(Payment.provider, Payment.external_payment_id).in_(payment_keys)
+            )
+            .with_for_update(of=Payment)
+        )
+
+        return list(result.scalars().all())
+
+    def _apply_payment_status(
+        self, payment: Payment, payment_status: PaymentStatus
+    ) -> bool:
+        status = PAYMENT_STATUS_MAP.get(payment_status.status)
+
+        # Events can arrive out of order, a settled payment is never reopened
+        if (
+            status is None
+            or status == payment.status
+            or payment.status in FINAL_PAYMENT_STATUSES
+        ):
+            return False
+
+        payment.status = status
+        payment.payment_method = payment_status.payment_method or payment.payment_method
+
+        if payment_status.paid_at:
+            paid_at = payment_status.paid_at
+
+            if paid_at.tzinfo is not None:
+                paid_at = paid_at.astimezone(UTC).replace(tzinfo=None)
+
+            payment.paid_at = paid_at
+
+        subscription = payment.subscription
+
+        if status == PaymentStatusEnum.SUCCESS:
+            subscription.is_active = True
+            subscription.failed_payment_attempts = 0
+            subscription.last_payment_id = payment.id
+        elif status == PaymentStatusEnum.CANCELED:
+            subscription.failed_payment_attempts = (
+                subscription.failed_payment_attempts or 0
+            ) + 1
+
+            if subscription.last_payment_id == payment.id:
+                subscription.is_active = False
+
+        return True
+
+
+async def get_payment_webhook_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    payment_provider_factory: Annotated[
+        PaymentProviderFactory, Depends(get_payment_provider_factory)
+    ],
+) -> PaymentWebhookService:
+    return PaymentWebhookService(
+        db=db,
+        payment_provider_factory=payment_provider_factory,
+    )
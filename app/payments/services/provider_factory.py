@@ -1,3 +1,4 @@
+from payments.clients.yookassa_api_client import YookassaApiClient
 from payments.services.base_payment_provider import BasePaymentProvider
 from payments.enum.provider import PaymentProvider
 from payments.services.yookassa_payment_provider import YookassaPaymentProvider
@@ -7,13 +8,25 @@ from common.log.logger import logger
 
 
 class PaymentProviderFactory:
-    @staticmethod
-    def create(provider: PaymentProvider) -> BasePaymentProvider:
+    def __init__(self) -> None:
+        self._providers: dict[PaymentProvider, BasePaymentProvider] = {}
+
+    def create(self, provider: PaymentProvider) -> BasePaymentProvider:
+        # Providers are stateless over the shared HTTP client, one per process is enough
+        if provider not in self._providers:
+            self._providers[provider] = self._build(provider)
+
+        return self._providers[provider]
+
+    def _build(self, provider: PaymentProvider) -> BasePaymentProvider:
         match provider:
             case PaymentProvider.YOOKASSA:
                 return YookassaPaymentProvider(
-                    secret_key=payment_settings.YOOKASSA_SECRET_KEY,
-                    shop_id=payment_settings.YOOKASSA_SHOP_ID,
+                    yookassa_api_client=YookassaApiClient(
+                        base_url=payment_settings.YOOKASSA_API_URL,
+                        shop_id=payment_settings.YOOKASSA_SHOP_ID,
+                        secret_key=payment_settings.YOOKASSA_SECRET_KEY,
+                    ),
                 )
             case _:
                 logger.error(f"Unknown payment provider: {provider}")
@@ -23,5 +36,8 @@ class PaymentProviderFactory:
                 )
 
 
+payment_provider_factory = PaymentProviderFactory()
+
+
 async def get_payment_provider_factory() -> PaymentProviderFactory:
-    return PaymentProviderFactory()
+    return payment_provider_factory
@@ -1,23 +1,48 @@
-from yookassa import Configuration, Payment as YooPayment, Refund
-from yookassa.domain.notification import WebhookNotification
-from yookassa.domain.response import PaymentResponse as YooPaymentResponse
+import ipaddress
+import re
 from decimal import Decimal
 from datetime import datetime
 import uuid
 from typing import Dict, Any, Optional
 
+from payments.clients.yookassa_api_client import YookassaApiClient
+from payments.config.payment_config import payment_settings
 from payments.schemas.base.payment_result import PaymentResult
 from payments.schemas.base.payment_status import PaymentStatus
 from payments.schemas.base.refund_result import RefundResult
 from payments.services.base_payment_provider import BasePaymentProvider
+from payments.services.payment_webhook_error import PaymentWebhookError
 from payments.enum.currency import Currency
 from common.log.logger import logger
 
+WEBHOOK_EVENTS = {
+    "payment.waiting_for_capture",
+    "payment.succeeded",
+    "payment.canceled",
+}
+WEBHOOK_NETWORKS = [
+    ipaddress.ip_network(network)
+    for network in payment_settings.YOOKASSA_WEBHOOK_NETWORKS
+]
+PAYMENT_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+
+def is_ip_in_networks(
+    ip: str, networks: list[ipaddress.IPv4Network | ipaddress.IPv6Network]
+) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+
+    return any(address in network for network in networks)
+
 
 class YookassaPaymentProvider(BasePaymentProvider):
-    def __init__(self, shop_id: str, secret_key: str):
-        Configuration.account_id = shop_id
-        Configuration.secret_key = secret_key
+    def __init__(self, yookassa_api_client: YookassaApiClient):
+        self._yookassa_api_client = yookassa_api_client
 
     async def create_payment(
         self,
@@ -30,10 +55,10 @@ class YookassaPaymentProvider(BasePaymentProvider):
     ) -> PaymentResult:
         capture = kwargs.get("capture", True)
 
-        yoo_payment = YooPayment.create(
+        yoo_payment = await self._yookassa_api_client.create_payment(
             {
                 "amount": {
-                    "value": amount,
+                    "value": str(amount),
                     "currency": currency.value,
                 },
                 "confirmation": {
@@ -41,30 +66,34 @@ class YookassaPaymentProvider(BasePaymentProvider):
                     "return_url": return_url,
                 },
                 "capture": capture,
+                "description": description,
                 "metadata": metadata or {},
             },
-            str(uuid.uuid4()),
+            idempotence_key=kwargs.get("idempotence_key") or str(uuid.uuid4()),
         )
 
         return PaymentResult(
-            payment_id=yoo_payment.id,
-            payment_method=yoo_payment.payment_method,
-            confirmation_url=yoo_payment.confirmation_url,
-            status=yoo_payment.status,
-            amount=Decimal(yoo_payment.amount),
-            currency=yoo_payment.amount.currency,
-            metadata=yoo_payment.metadata,
+            payment_id=yoo_payment["id"],
+            payment_method=self._get_payment_method(yoo_payment),
+            confirmation_url=yoo_payment.get("confirmation", {}).get(
+                "confirmation_url"
+            ),
+            status=yoo_payment["status"],
+            amount=Decimal(yoo_payment["amount"]["value"]),
+            currency=yoo_payment["amount"]["currency"],
+            metadata=yoo_payment.get("metadata") or {},
         )
 
     async def get_payment_status(self, payment_id: str) -> PaymentStatus:
-        yoo_payment = YooPayment.find_one(payment_id)
+        yoo_payment = await self._yookassa_api_client.get_payment(payment_id)
 
         return await self._get_payment_info(yoo_payment)
 
     async def cancel_payment(self, payment_id: str) -> bool:
         try:
-            yoo_payment = YooPayment.find_one(payment_id)
-            YooPayment.cancel(yoo_payment.id, str(uuid.uuid4()))
+            await self._yookassa_api_client.cancel_payment(
+                payment_id, idempotence_key=str(uuid.uuid4())
+            )
 
             return True
         except Exception as e:
@@ -79,31 +108,48 @@ class YookassaPaymentProvider(BasePaymentProvider):
         currency: Currency = None,
     ) -> RefundResult:
         if amount is None:
-            yoo_payment = YooPayment.find_one(payment_id)
-            amount = Decimal(yoo_payment.amount)
-            currency = yoo_payment.amount.currency
+            yoo_payment = await self._yookassa_api_client.get_payment(payment_id)
+            amount = Decimal(yoo_payment["amount"]["value"])
+            currency = yoo_payment["amount"]["currency"]
         else:
             currency = currency.value
 
-        refund = Refund.create(
+        refund = await self._yookassa_api_client.create_refund(
             {
+                "payment_id": payment_id,
                 "amount": {
-                    "value": amount,
+                    "value": str(amount),
                     "currency": currency,
                 },
             },
-            str(uuid.uuid4()),
+            idempotence_key=str(uuid.uuid4()),
         )
 
         return RefundResult(
-            refund_id=refund.id,
-            status=refund.status,
-            amount=Decimal(refund.amount.value),
+            refund_id=refund["id"],
+            status=refund["status"],
+            amount=Decimal(refund["amount"]["value"]),
         )
 
-    async def verify_webhook(self, data: Dict[str, Any]) -> PaymentStatus:
-        notification = WebhookNotification(data)
-        yoo_payment = notification.object
+    async def verify_webhook(
+        self, data: Dict[str, Any], sender_ip: str
+    ) -> PaymentStatus:
+        # The endpoint is public, so only YooKassa's addresses and well-formed
+        # payment events are stored and later verified against the API
+        if not is_ip_in_networks(sender_ip, WEBHOOK_NETWORKS):
+            raise PaymentWebhookError(f"sender {sender_ip} is not YooKassa")
+
+        yoo_payment = data.get("object")
+
+        if (
+            data.get("type") != "notification"
+            or data.get("event") not in WEBHOOK_EVENTS
+            or not isinstance(yoo_payment, dict)
+            or not isinstance(yoo_payment.get("id"), str)
+            or not PAYMENT_ID_PATTERN.fullmatch(yoo_payment["id"])
+            or yoo_payment.get("status") != data["event"].removeprefix("payment.")
+        ):
+            raise PaymentWebhookError("malformed YooKassa notification")
 
         return await self._get_payment_info(yoo_payment)
 
@@ -115,7 +161,7 @@ class YookassaPaymentProvider(BasePaymentProvider):
         description: str,
         metadata: Dict[str, Any] = None,
     ) -> PaymentResult:
-        yoo_payment = YooPayment.create(
+        yoo_payment = await self._yookassa_api_client.create_payment(
             {
                 "amount": {
                     "value": str(amount),
@@ -126,35 +172,38 @@ class YookassaPaymentProvider(BasePaymentProvider):
                 "description": description,
                 "metadata": metadata or {},
             },
-            str(uuid.uuid4()),
+            idempotence_key=str(uuid.uuid4()),
         )
 
         return PaymentResult(
-            payment_id=yoo_payment.id,
+            payment_id=yoo_payment["id"],
+            payment_method=self._get_payment_method(yoo_payment),
             confirmation_url=None,
-            status=await self._map_payment_statuses(yoo_payment.status),
+            status=await self._map_payment_statuses(yoo_payment["status"]),
             currency=currency,
-            amount=Decimal(yoo_payment.amount),
-            metadata=yoo_payment.metadata,
+            amount=Decimal(yoo_payment["amount"]["value"]),
+            metadata=yoo_payment.get("metadata") or {},
         )
 
-    async def _get_payment_info(self, yoo_payment: YooPaymentResponse) -> PaymentStatus:
+    async def _get_payment_info(self, yoo_payment: Dict[str, Any]) -> PaymentStatus:
         paid_at = None
-        if yoo_payment.status == "succeeded" and yoo_payment.captured_at:
-            paid_at = datetime.fromisoformat(str(yoo_payment.captured_at))
-
-        payment_method = None
-        if yoo_payment.payment_method:
-            payment_method = yoo_payment.payment_method
+        if yoo_payment["status"] == "succeeded" and yoo_payment.get("captured_at"):
+            paid_at = datetime.fromisoformat(yoo_payment["captured_at"])
 
         return PaymentStatus(
-            payment_id=yoo_payment.id,
-            status=yoo_payment.status,
-            payment_method=payment_method,
+            payment_id=yoo_payment["id"],
+            status=yoo_payment["status"],
+            payment_method=self._get_payment_method(yoo_payment),
             paid_at=paid_at,
-            metadata=yoo_payment.metadata or {},
+            metadata=yoo_payment.get("metadata") or {},
         )
 
+    def _get_payment_method(self, yoo_payment: Dict[str, Any]) -> Optional[str]:
+        payment_method = yoo_payment.get("payment_method")
+
+        # The method id is what a recurring payment is charged against later
+        return payment_method.get("id") if payment_method else None
+
     async def _map_payment_statuses(self, yoo_status: str) -> str:
         status_map = {
             "waiting_for_capture": "pending",
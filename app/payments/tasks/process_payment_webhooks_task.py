@@ -0,0 +1,29 @@
+from common.celery.celery_app import celery_app
+from common.celery.worker_event_loop import run_async
+from common.db.database import AsyncSessionLocal
+from common.log.logger import logger
+from payments.config.payment_config import payment_settings
+from payments.services.payment_webhook_service import PaymentWebhookService
+from payments.services.provider_factory import payment_provider_factory
+
+
+async def process_payment_webhooks() -> int:
+    async with AsyncSessionLocal() as db:
+        payment_webhook_service = PaymentWebhookService(
+            db=db,
+            payment_provider_factory=payment_provider_factory,
+        )
+
+        return await payment_webhook_service.process_pending_events(
+            limit=payment_settings.PAYMENT_WEBHOOK_BATCH_SIZE
+        )
+
+
+@celery_app.task(name="process_payment_webhooks_task")
+def process_payment_webhooks_task() -> int:
+    processed_count = run_async(process_payment_webhooks())
+
+    if processed_count:
+        logger.info(f"Processed {processed_count} payment webhook events")
+
+    return processed_count
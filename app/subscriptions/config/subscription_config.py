@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class SubscriptionSettings(BaseSettings):
+    SUBSCRIPTION_CACHE_TTL_SECONDS: int = 600
+    SUBSCRIPTION_CACHE_LOCAL_TTL_SECONDS: float = 30
+    SUBSCRIPTION_CACHE_LOCAL_MAX_SIZE: int = 10000
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="allow",
+    )
+
+
+subscription_settings = SubscriptionSettings()
@@ -21,6 +21,19 @@ class SubscriptionPlan(Enum):
                     "SubscriptionPlan:get_recipients_limit: Invalid subscription plan"
                 )
 
+    def get_send_priority(self) -> int:
+        match self:
+            case self.TRIAL:
+                return 3
+            case self.STANDARD:
+                return 6
+            case self.PREMIUM:
+                return 9
+            case _:
+                raise ValueError(
+                    "SubscriptionPlan:get_send_priority: Invalid subscription plan"
+                )
+
     def get_days_count(self) -> int:
         year = datetime.today().year
         month = datetime.today().month
@@ -22,7 +22,15 @@ class Subscription(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
 
     user = relationship(argument="User", back_populates="subscriptions")
+    # Payments and subscriptions reference each other, the pointer to the last
+    # payment is written after both rows exist
     last_payment = relationship(
-        argument="Payment", foreign_keys="subscriptions.last_payment_id"
+        argument="Payment",
+        foreign_keys="Subscription.last_payment_id",
+        post_update=True,
+    )
+    payments = relationship(
+        argument="Payment",
+        back_populates="subscription",
+        foreign_keys="Payment.subscription_id",
     )
-    payments = relationship(argument="Payment", back_populates="subscription")
@@ -17,7 +17,7 @@ from subscriptions.services.subscription_service import (
     get_subscription_service,
 )
 from users.dependencies.get_current_user import get_current_user
-from users.models.user import User
+from users.schemas.user_snapshot import UserSnapshot
 
 
 subscription_router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
@@ -26,7 +26,7 @@ subscription_router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 @subscription_router.post(path="/subscribe")
 async def start_base_premium_subscription(
     request: CreatePaymentRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
     payment_provider_factory: Annotated[
         PaymentProviderFactory, Depends(get_payment_provider_factory)
     ],
@@ -41,9 +41,9 @@ async def start_base_premium_subscription(
             detail=f"Trial plan is another route",
         )
 
-    subscription = await subscription_service.get_user_active_subscription(current_user)
+    entitlement = await subscription_service.get_user_entitlement(current_user)
 
-    if subscription:
+    if entitlement.is_active:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Already subscribed",
@@ -93,7 +93,7 @@ async def start_base_premium_subscription(
 
 @subscription_router.post(path="/trial")
 async def start_trial_subscription(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserSnapshot, Depends(get_current_user)],
     subscription_service: Annotated[
         SubscriptionService, Depends(get_subscription_service)
     ],
@@ -0,0 +1,53 @@
+from datetime import UTC, datetime
+
+from subscriptions.enum.plan import SubscriptionPlan
+from subscriptions.models.subscription import Subscription
+
+
+class SubscriptionEntitlement:
+    __slots__ = ("end_at", "plan", "recipients_limit")
+
+    def __init__(
+        self,
+        plan: SubscriptionPlan | None,
+        recipients_limit: int,
+        end_at: datetime | None,
+    ) -> None:
+        self.plan = plan
+        self.recipients_limit = recipients_limit
+        self.end_at = end_at
+
+    @classmethod
+    def from_subscription(
+        cls, subscription: Subscription | None
+    ) -> "SubscriptionEntitlement":
+        if subscription is None:
+            return cls(plan=None, recipients_limit=0, end_at=None)
+
+        return cls(
+            plan=subscription.plan,
+            recipients_limit=subscription.plan.get_recipients_limit(),
+            end_at=subscription.end_at,
+        )
+
+    @classmethod
+    def from_hash(cls, data: dict[str, str]) -> "SubscriptionEntitlement":
+        return cls(
+            plan=SubscriptionPlan(data["plan"]) if data["plan"] else None,
+            recipients_limit=int(data["recipients_limit"]),
+            end_at=datetime.fromisoformat(data["end_at"]) if data["end_at"] else None,
+        )
+
+    def to_hash(self) -> dict[str, str]:
+        return {
+            "plan": self.plan.value if self.plan else "",
+            "recipients_limit": str(self.recipients_limit),
+            "end_at": self.end_at.isoformat() if self.end_at else "",
+        }
+
+    @property
+    def is_active(self) -> bool:
+        # Subscription dates are stored as naive UTC
+        return self.plan is not None and (
+            self.end_at is None or self.end_at.replace(tzinfo=UTC) > datetime.now(UTC)
+        )
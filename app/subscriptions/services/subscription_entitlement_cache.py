@@ -0,0 +1,50 @@
+from datetime import UTC, datetime
+from redis.asyncio import Redis
+
+from common.cache.two_tier_cache import TwoTierCache
+from subscriptions.config.subscription_config import subscription_settings
+from subscriptions.schemas.subscription_entitlement import SubscriptionEntitlement
+
+
+class SubscriptionEntitlementCache(TwoTierCache[int, SubscriptionEntitlement]):
+    async def _load(
+        self, redis_client: Redis, redis_key: str
+    ) -> SubscriptionEntitlement | None:
+        data = await redis_client.hgetall(redis_key)
+
+        if not data:
+            return None
+
+        return SubscriptionEntitlement.from_hash(data)
+
+    async def _store(
+        self,
+        redis_client: Redis,
+        redis_key: str,
+        entitlement: SubscriptionEntitlement,
+        ttl: int,
+    ) -> None:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(redis_key)
+            pipe.hset(redis_key, mapping=entitlement.to_hash())
+            pipe.expire(redis_key, ttl)
+            await pipe.execute()
+
+    def _get_ttl(self, entitlement: SubscriptionEntitlement) -> int:
+        # An entitlement must not outlive the subscription it was built from
+        if entitlement.end_at is None:
+            return self._ttl
+
+        seconds_left = (
+            entitlement.end_at.replace(tzinfo=UTC) - datetime.now(UTC)
+        ).total_seconds()
+
+        return min(self._ttl, int(seconds_left))
+
+
+subscription_entitlement_cache = SubscriptionEntitlementCache(
+    key_prefix="subscription_entitlement",
+    local_max_size=subscription_settings.SUBSCRIPTION_CACHE_LOCAL_MAX_SIZE,
+    local_ttl=subscription_settings.SUBSCRIPTION_CACHE_LOCAL_TTL_SECONDS,
+    ttl=subscription_settings.SUBSCRIPTION_CACHE_TTL_SECONDS,
+)
@@ -10,7 +10,12 @@ from common.redis.redis_client import get_redis_client
 from payments.models.payment import Payment
 from subscriptions.enum.plan import SubscriptionPlan
 from users.models.user import User
+from users.services.user_identity_cache import user_identity_cache
 from subscriptions.models.subscription import Subscription
+from subscriptions.schemas.subscription_entitlement import SubscriptionEntitlement
+from subscriptions.services.subscription_entitlement_cache import (
+    subscription_entitlement_cache,
+)
 from campaigns.services.campaign_service import CampaignService, get_campaign_service
 
 
@@ -45,6 +50,8 @@ class SubscriptionService:
         subscription.last_payment = last_payment
 
         await self._db.commit()
+        await subscription_entitlement_cache.invalidate(subscription.user_id)
+        await user_identity_cache.invalidate(subscription.user_id)
 
     async def create_subscription(
         self,
@@ -62,6 +69,9 @@ class SubscriptionService:
         await self._db.commit()
         await self._db.refresh(subscription)
 
+        await subscription_entitlement_cache.invalidate(user.id)
+        await user_identity_cache.invalidate(user.id)
+
         return subscription
 
     async def get_user_active_subscription(self, user: User) -> Subscription | None:
@@ -73,16 +83,37 @@ class SubscriptionService:
 
         return result.scalar_one_or_none()
 
-    async def check_if_user_can_send_emails(self, user: User) -> tuple[bool, str]:
+    async def get_user_entitlement(self, user: User) -> SubscriptionEntitlement:
+        entitlement = await subscription_entitlement_cache.get(user.id)
+
+        if entitlement is not None:
+            return entitlement
+
         subscription = await self.get_user_active_subscription(user)
-        if not subscription:
+        entitlement = SubscriptionEntitlement.from_subscription(subscription)
+
+        await subscription_entitlement_cache.set(user.id, entitlement)
+
+        return entitlement
+
+    async def get_user_recipients_limit(self, user: User) -> int | None:
+        entitlement = await self.get_user_entitlement(user)
+
+        if not entitlement.is_active:
+            return None
+
+        return entitlement.recipients_limit
+
+    async def check_if_user_can_send_emails(self, user: User) -> tuple[bool, str]:
+        recipients_limit = await self.get_user_recipients_limit(user)
+        if recipients_limit is None:
             return False, "No active subscription"
 
         today_recipients_count = await self._campaign_service.get_user_daily_sent_count(
             user
         )
 
-        if today_recipients_count > subscription.plan.get_recipients_limit():
+        if today_recipients_count >= recipients_limit:
             return False, "Already used limits"
 
         return True, ""
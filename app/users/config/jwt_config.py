@@ -7,6 +7,8 @@ class JwtSettings(BaseSettings):
     JWT_REFRESH_SECRET_FOR_AUTH: str = ""
     JWT_ACCESS_TOKEN_EXPIRES_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRES_DAYS: int = 7
+    JWT_VERIFIED_TOKEN_CACHE_SIZE: int = 10000
+    JWT_VERIFIED_TOKEN_CACHE_TTL_SECONDS: float = 300
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,21 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UserSettings(BaseSettings):
+    USER_CACHE_TTL_SECONDS: int = 300
+    USER_CACHE_LOCAL_TTL_SECONDS: float = 30
+    USER_CACHE_LOCAL_MAX_SIZE: int = 10000
+    PROFILE_ENRICHMENT_BATCH_SIZE: int = 100
+    PROFILE_ENRICHMENT_CONCURRENCY: int = 10
+    PROFILE_ENRICHMENT_INTERVAL_SECONDS: float = 5
+    PROFILE_ENRICHMENT_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    PROFILE_ENRICHMENT_MAX_ATTEMPTS: int = 5
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="allow",
+    )
+
+
+user_settings = UserSettings()
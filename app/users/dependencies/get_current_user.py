@@ -6,14 +6,15 @@ from users.services.user_service import UserService, get_user_service
 from common.security.security import security
 from common.log.logger import logger
 from users.services.jwt_service import JwtService, get_jwt_service
-from users.models.user import User
+from users.services.user_identity_cache import user_identity_cache
+from users.schemas.user_snapshot import UserSnapshot
 
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     user_service: UserService = Depends(get_user_service),
     jwt_service: JwtService = Depends(get_jwt_service),
-) -> User:
+) -> UserSnapshot:
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,15 +42,23 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = await user_service.find_by_id(user_id=user_id)
+        user = await user_identity_cache.get(user_id)
 
-        if user is None:
+        if user is not None:
+            return user
+
+        db_user = await user_service.find_by_id(user_id=user_id)
+
+        if db_user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="No user found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        user = UserSnapshot.from_user(db_user)
+        await user_identity_cache.set(user)
+
         return user
 
     except Exception as e:
@@ -3,7 +3,7 @@ from fastapi.responses import JSONResponse
 from typing import Annotated
 
 from users.dependencies.get_current_user import get_current_user
-from users.models.user import User
+from users.schemas.user_snapshot import UserSnapshot
 from users.services.jwt_service import JwtService, get_jwt_service
 
 jwt_router = APIRouter(prefix="/auth/jwt", tags=["auth_jwt"])
@@ -48,7 +48,7 @@ async def get_jwt(
 async def refresh_token(
     request: Request,
     jwt_service: Annotated[JwtService, Depends(get_jwt_service)],
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
 ):
     refresh_token = request.cookies.get("refresh_token")
 
@@ -97,7 +97,7 @@ async def refresh_token(
 
 
 @jwt_router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: UserSnapshot = Depends(get_current_user)):
     response = JSONResponse(content={"message": "Successfully logged out"})
 
     response.delete_cookie(key="access_token")
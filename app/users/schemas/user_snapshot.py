@@ -0,0 +1,55 @@
+from typing import Any
+
+from users.models.user import User
+
+
+class UserSnapshot:
+    __slots__ = (
+        "email",
+        "first_name",
+        "id",
+        "last_name",
+        "oauth_id",
+        "picture",
+        "timezone",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        first_name: str | None,
+        last_name: str | None,
+        picture: str | None,
+        timezone: str | None,
+        oauth_id: str | None,
+    ) -> None:
+        self.id = id
+        self.email = email
+        self.first_name = first_name
+        self.last_name = last_name
+        self.picture = picture
+        self.timezone = timezone
+        self.oauth_id = oauth_id
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            picture=user.picture,
+            timezone=user.timezone,
+            oauth_id=user.oauth_id,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "UserSnapshot":
+        return cls(**data)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"UserSnapshot(id={self.id}, email={self.email})"
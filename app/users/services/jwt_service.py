@@ -1,6 +1,8 @@
-from datetime import datetime, timedelta
+import hashlib
+import time
+from datetime import UTC, datetime, timedelta
 import jwt
-from typing import Dict, Any, Optional, Tuple, Annotated
+from typing import Any, Annotated
 from fastapi import HTTPException, status, Depends
 from fastapi.responses import Response
 
@@ -10,8 +12,15 @@ from subscriptions.services.subscription_service import (
     get_subscription_service,
 )
 from users.services.user_service import UserService, get_user_service
+from common.cache.ttl_lru_cache import TTLLRUCache
 from common.log.logger import logger
 
+# Signature checks are skipped for tokens this process has already verified
+_verified_tokens = TTLLRUCache[str, dict[str, Any]](
+    max_size=jwt_settings.JWT_VERIFIED_TOKEN_CACHE_SIZE,
+    ttl=jwt_settings.JWT_VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+)
+
 
 class JwtService:
     def __init__(
@@ -25,28 +34,28 @@ class JwtService:
         self._subscription_service = subscription_service
         self._user_service = user_service
 
-    async def create_access_token(self, user_data: Dict[str, Any]) -> str:
+    async def create_access_token(self, user_data: dict[str, Any]) -> str:
         to_encode = user_data.copy()
-        expire = datetime.utcnow() + timedelta(
+        expire = datetime.now(UTC) + timedelta(
             minutes=jwt_settings.JWT_ACCESS_TOKEN_EXPIRES_MINUTES
         )
-        to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
+        to_encode.update({"exp": expire, "iat": datetime.now(UTC), "type": "access"})
 
         return jwt.encode(to_encode, self._access_secret, algorithm=self._algorithm)
 
-    async def create_refresh_token(self, user_data: Dict[str, Any]) -> str:
+    async def create_refresh_token(self, user_data: dict[str, Any]) -> str:
         to_encode = user_data.copy()
-        expire = datetime.utcnow() + timedelta(
+        expire = datetime.now(UTC) + timedelta(
             minutes=jwt_settings.JWT_REFRESH_TOKEN_EXPIRES_DAYS
         )
-        to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
+        to_encode.update({"exp": expire, "iat": datetime.now(UTC), "type": "refresh"})
 
         return jwt.encode(to_encode, self._refresh_secret, algorithm=self._algorithm)
 
-    async def verify_access_token(self, token: str) -> Optional[Dict[str, Any]]:
+    async def verify_access_token(self, token: str) -> dict[str, Any] | None:
         return await self._verify_token(token, "access", self._access_secret)
 
-    async def verify_refresh_token(self, token: str) -> Optional[Dict[str, Any]]:
+    async def verify_refresh_token(self, token: str) -> dict[str, Any] | None:
         return await self._verify_token(token, "refresh", self._refresh_secret)
 
     async def _verify_token(
@@ -54,7 +63,13 @@ class JwtService:
         token: str,
         expected_type: str,
         secret: str,
-    ) -> Dict[str, Any]:
+    ) -> dict[str, Any]:
+        token_key = f"{expected_type}:{hashlib.sha256(token.encode()).hexdigest()}"
+        payload = _verified_tokens.get(token_key)
+
+        if payload is not None:
+            return payload
+
         try:
             payload = jwt.decode(token, secret, algorithms=[self._algorithm])
 
@@ -64,6 +79,12 @@ class JwtService:
                     detail=f"Invalid token type. Expected {expected_type}",
                 )
 
+            _verified_tokens.set(
+                token_key,
+                payload,
+                ttl=payload["exp"] - time.time() if "exp" in payload else None,
+            )
+
             return payload
 
         except jwt.ExpiredSignatureError:
@@ -78,7 +99,7 @@ class JwtService:
                 detail=f"Invalid token: {str(e)}",
             )
 
-    async def refresh_token(self, refresh_token: str) -> Dict[str, str]:
+    async def refresh_token(self, refresh_token: str) -> dict[str, str]:
         payload = await self.verify_refresh_token(refresh_token)
         user_data = payload.get("user_info")
 
@@ -109,13 +130,13 @@ class JwtService:
             "token_type": "Bearer",
         }
 
-    async def create_jwt_pair_from_data(self, data: dict) -> Tuple[str, str]:
+    async def create_jwt_pair_from_data(self, data: dict) -> tuple[str, str]:
         access_jwt_token = await self.create_access_token(user_data=data)
         refresh_jwt_token = await self.create_refresh_token(user_data=data)
 
         return access_jwt_token, refresh_jwt_token
 
-    async def extract_token(self, token: str | None) -> Optional[str]:
+    async def extract_token(self, token: str | None) -> str | None:
         if not token:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="No token provided"
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Annotated
+from fastapi import Depends, HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import LockError
+
+from common.log.logger import logger
+from common.redis.redis_client import get_redis_client
+from google_integration.auth.services.google_token_manager import (
+    GoogleTokenManager,
+    get_google_token_manager,
+)
+from google_integration.auth.services.google_token_refresh_error import (
+    GoogleTokenRefreshError,
+)
+from google_integration.calendar.services.calendar_service import (
+    GoogleCalendarService,
+    get_google_calendar_service,
+)
+from google_integration.clients.google_api_error import GoogleApiError
+from users.config.user_config import user_settings
+from users.services.user_service import UserService, get_user_service
+
+PENDING_PROFILES_KEY = "profile_enrichment:pending"
+ENRICHMENT_ATTEMPTS_KEY = "profile_enrichment:attempts"
+
+
+class ProfileEnrichmentService:
+    def __init__(
+        self,
+        user_service: UserService,
+        redis_client: Redis,
+        google_calendar_service: GoogleCalendarService,
+        google_token_manager: GoogleTokenManager,
+    ) -> None:
+        self._user_service = user_service
+        self._redis_client = redis_client
+        self._google_calendar_service = google_calendar_service
+        self._google_token_manager = google_token_manager
+
+    async def request_enrichment(self, user_id: int) -> None:
+        # Recently enriched profiles are skipped, repeated logins only queue once
+        if await self._redis_client.exists(self._get_enriched_key(user_id)):
+            return
+
+        await self._redis_client.sadd(PENDING_PROFILES_KEY, user_id)
+
+    async def enrich_pending_profiles(self) -> int:
+        user_ids = await self._redis_client.spop(
+            PENDING_PROFILES_KEY, user_settings.PROFILE_ENRICHMENT_BATCH_SIZE
+        )
+
+        if not user_ids:
+            return 0
+
+        user_ids = [int(user_id) for user_id in user_ids]
+        semaphore = asyncio.Semaphore(user_settings.PROFILE_ENRICHMENT_CONCURRENCY)
+        retry_user_ids: list[int] = []
+
+        async def resolve_timezone(user_id: int) -> str | None:
+            async with semaphore:
+                try:
+                    access_token = await self._google_token_manager.get_access_token(
+                        user_id
+                    )
+                except (HTTPException, GoogleTokenRefreshError) as e:
+                    logger.warning(f"Skipping profile enrichment for {user_id}: {e}")
+                    return None
+                except LockError as e:
+                    logger.warning(f"Retrying profile enrichment for {user_id}: {e}")
+                    retry_user_ids.append(user_id)
+                    return None
+
+                try:
+                    timezone = await self._google_calendar_service.get_user_timezone(
+                        access_token
+                    )
+                except GoogleApiError as e:
+                    logger.warning(f"Retrying profile enrichment for {user_id}: {e}")
+                    retry_user_ids.append(user_id)
+                    return None
+
+                return str(timezone) if timezone is not None else None
+
+        timezones = await asyncio.gather(
+            *(resolve_timezone(user_id) for user_id in user_ids)
+        )
+        # Users whose timezone could not be read keep the one they have
+        resolved_timezones = {
+            user_id: timezone
+            for user_id, timezone in zip(user_ids, timezones)
+            if timezone is not None
+        }
+
+        await self._user_service.set_timezones_for_users(resolved_timezones)
+
+        async with self._redis_client.pipeline(transaction=False) as pipeline:
+            for user_id in resolved_timezones:
+                pipeline.set(
+                    self._get_enriched_key(user_id),
+                    1,
+                    ex=user_settings.PROFILE_ENRICHMENT_TTL_SECONDS,
+                )
+
+            done_user_ids = [
+                user_id for user_id in user_ids if user_id not in retry_user_ids
+            ]
+
+            if done_user_ids:
+                pipeline.hdel(ENRICHMENT_ATTEMPTS_KEY, *done_user_ids)
+
+            await pipeline.execute()
+
+        await self._retry_enrichment(retry_user_ids)
+
+        return len(resolved_timezones)
+
+    async def _retry_enrichment(self, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+
+        async with self._redis_client.pipeline(transaction=False) as pipeline:
+            for user_id in user_ids:
+                pipeline.hincrby(ENRICHMENT_ATTEMPTS_KEY, user_id, 1)
+
+            attempts = await pipeline.execute()
+
+        # Failing users are retried on later runs, up to a bounded number of times
+        retry_user_ids = [
+            user_id
+            for user_id, attempt in zip(user_ids, attempts)
+            if attempt < user_settings.PROFILE_ENRICHMENT_MAX_ATTEMPTS
+        ]
+        dropped_user_ids = [
+            user_id for user_id in user_ids if user_id not in retry_user_ids
+        ]
+
+        if retry_user_ids:
+            await self._redis_client.sadd(PENDING_PROFILES_KEY, *retry_user_ids)
+
+        if dropped_user_ids:
+            logger.warning(f"Giving up profile enrichment for {dropped_user_ids}")
+            await self._redis_client.hdel(ENRICHMENT_ATTEMPTS_KEY, *dropped_user_ids)
+
+    def _get_enriched_key(self, user_id: int) -> str:
+        return f"profile_enrichment:done:{user_id}"
+
+
+async def get_profile_enrichment_service(
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    google_calendar_service: Annotated[
+        GoogleCalendarService, Depends(get_google_calendar_service)
+    ],
+    google_token_manager: Annotated[
+        GoogleTokenManager, Depends(get_google_token_manager)
+    ],
+) -> ProfileEnrichmentService:
+    return ProfileEnrichmentService(
+        user_service=user_service,
+        redis_client=redis_client,
+        google_calendar_service=google_calendar_service,
+        google_token_manager=google_token_manager,
+    )
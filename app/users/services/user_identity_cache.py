@@ -0,0 +1,32 @@
+import json
+from redis.asyncio import Redis
+
+from common.cache.two_tier_cache import TwoTierCache
+from users.config.user_config import user_settings
+from users.schemas.user_snapshot import UserSnapshot
+
+
+class UserIdentityCache(TwoTierCache[int, UserSnapshot]):
+    async def set(self, user: UserSnapshot) -> None:
+        await super().set(user.id, user)
+
+    async def _load(self, redis_client: Redis, redis_key: str) -> UserSnapshot | None:
+        data = await redis_client.get(redis_key)
+
+        if data is None:
+            return None
+
+        return UserSnapshot.from_dict(json.loads(data))
+
+    async def _store(
+        self, redis_client: Redis, redis_key: str, user: UserSnapshot, ttl: int
+    ) -> None:
+        await redis_client.set(redis_key, json.dumps(user.to_dict()), ex=ttl)
+
+
+user_identity_cache = UserIdentityCache(
+    key_prefix="user_identity",
+    local_max_size=user_settings.USER_CACHE_LOCAL_MAX_SIZE,
+    local_ttl=user_settings.USER_CACHE_LOCAL_TTL_SECONDS,
+    ttl=user_settings.USER_CACHE_TTL_SECONDS,
+)
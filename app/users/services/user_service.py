@@ -1,12 +1,13 @@
 from typing import Dict, Annotated
 from fastapi import Depends
 from pydantic import EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.db.database import get_db
 from users.models.user import User
 from users.schemas.find_or_create_user import FindOrCreateUser
+from users.services.user_identity_cache import user_identity_cache
 
 
 class UserService:
@@ -33,6 +34,23 @@ class UserService:
         user.timezone = timezone
 
         await self._db.commit()
+        await user_identity_cache.invalidate(user.id)
+
+    async def set_timezones_for_users(self, timezones: dict[int, str]) -> None:
+        if not timezones:
+            return
+
+        await self._db.execute(
+            update(User),
+            [
+                {"id": user_id, "timezone": timezone}
+                for user_id, timezone in timezones.items()
+            ],
+        )
+        await self._db.commit()
+
+        for user_id in timezones:
+            await user_identity_cache.invalidate(user_id)
 
     async def _create(self, find_or_create_dto: FindOrCreateUser) -> User:
         user = User(
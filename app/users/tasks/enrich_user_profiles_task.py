@@ -0,0 +1,43 @@
+from common.celery.celery_app import celery_app
+from common.celery.worker_event_loop import run_async
+from common.db.database import AsyncSessionLocal
+from common.http.http_client import get_http_client
+from common.log.logger import logger
+from common.redis.redis_client import get_redis_client
+from google_integration.auth.services.google_token_manager import (
+    google_token_manager,
+)
+from google_integration.calendar.clients.calendar_api_client import (
+    CalendarApiClient,
+)
+from google_integration.calendar.services.calendar_service import (
+    GoogleCalendarService,
+)
+from users.services.profile_enrichment_service import ProfileEnrichmentService
+from users.services.user_service import UserService
+
+
+async def enrich_user_profiles() -> int:
+    async with AsyncSessionLocal() as db:
+        profile_enrichment_service = ProfileEnrichmentService(
+            user_service=UserService(db=db),
+            redis_client=await get_redis_client(),
+            google_calendar_service=GoogleCalendarService(
+                calendar_api_client=CalendarApiClient(
+                    http_client=await get_http_client()
+                ),
+            ),
+            google_token_manager=google_token_manager,
+        )
+
+        return await profile_enrichment_service.enrich_pending_profiles()
+
+
+@celery_app.task(name="enrich_user_profiles_task")
+def enrich_user_profiles_task() -> int:
+    enriched_count = run_async(enrich_user_profiles())
+
+    if enriched_count:
+        logger.info(f"Enriched {enriched_count} user profiles")
+
+    return enriched_count
@@ -0,0 +1,176 @@
+import uuid
+
+import pytest
+from campaigns.services.campaign_chunk_scheduler import (
+    CHUNK_KEY_PREFIX,
+    CHUNKS_IN_FLIGHT_KEY,
+    CampaignChunkScheduler,
+)
+from fakeredis import FakeAsyncRedis
+
+
+@pytest.fixture
+def redis_client() -> FakeAsyncRedis:
+    return FakeAsyncRedis()
+
+
+def build_scheduler(
+    redis_client: FakeAsyncRedis,
+    max_chunks_in_flight: int = 3,
+    lease_seconds: float = 60,
+) -> CampaignChunkScheduler:
+    return CampaignChunkScheduler(
+        redis_client=redis_client,
+        max_chunks_in_flight=max_chunks_in_flight,
+        quantum=2,
+        lease_seconds=lease_seconds,
+    )
+
+
+def chunks(count: int, size: int = 2) -> list[list[str]]:
+    return [[str(uuid.uuid4()) for _ in range(size)] for _ in range(count)]
+
+
+def chunk_ids(released: list[dict]) -> list[str]:
+    return [chunk["id"] for chunk in released]
+
+
+async def test_users_take_turns(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client, max_chunks_in_flight=4)
+    first, second = uuid.uuid4(), uuid.uuid4()
+    await scheduler.enqueue(1, first, chunks(3), priority=1)
+    await scheduler.enqueue(2, second, chunks(2), priority=5)
+
+    released = await scheduler.release()
+
+    assert chunk_ids(released) == [
+        f"{first}:0",
+        f"{second}:0",
+        f"{first}:1",
+        f"{second}:1",
+    ]
+    assert released[1]["priority"] == 5
+    assert released[1]["user_id"] == "2"
+
+
+async def test_large_chunks_wait_for_enough_deficit(
+    redis_client: FakeAsyncRedis,
+) -> None:
+    scheduler = build_scheduler(redis_client, max_chunks_in_flight=3)
+    small, large = uuid.uuid4(), uuid.uuid4()
+    await scheduler.enqueue(1, large, chunks(1, size=4), priority=0)
+    await scheduler.enqueue(2, small, chunks(3), priority=0)
+
+    released = await scheduler.release()
+
+    # The large chunk needs two visits of the quantum before it is released
+    assert chunk_ids(released) == [f"{small}:0", f"{large}:0", f"{small}:1"]
+
+
+async def test_release_respects_capacity(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client, max_chunks_in_flight=2)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(3), priority=0)
+
+    assert len(await scheduler.release()) == 2
+    assert await scheduler.release() == []
+
+    await scheduler.finish(campaign_id, f"{campaign_id}:0")
+
+    assert chunk_ids(await scheduler.release()) == [f"{campaign_id}:2"]
+
+
+async def test_enqueue_is_idempotent(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client, max_chunks_in_flight=10)
+    campaign_id = uuid.uuid4()
+    campaign_chunks = chunks(2)
+
+    await scheduler.enqueue(1, campaign_id, campaign_chunks, priority=0)
+    await scheduler.enqueue(1, campaign_id, campaign_chunks, priority=0)
+
+    assert len(await scheduler.release()) == 2
+
+
+async def test_last_chunk_finishes_the_campaign_once(
+    redis_client: FakeAsyncRedis,
+) -> None:
+    scheduler = build_scheduler(redis_client)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(2), priority=0)
+    await scheduler.release()
+
+    assert not await scheduler.finish(campaign_id, f"{campaign_id}:0")
+    # A redelivered chunk must not count as another finished chunk
+    assert not await scheduler.finish(campaign_id, f"{campaign_id}:0")
+    assert await scheduler.finish(campaign_id, f"{campaign_id}:1")
+    assert not await scheduler.finish(campaign_id, f"{campaign_id}:1")
+    assert await redis_client.zcard(CHUNKS_IN_FLIGHT_KEY) == 0
+
+
+async def test_requeued_chunks_go_back_to_the_front(
+    redis_client: FakeAsyncRedis,
+) -> None:
+    scheduler = build_scheduler(redis_client, max_chunks_in_flight=2)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(3), priority=0)
+    released = await scheduler.release()
+
+    assert await scheduler.requeue(chunk_ids(released)) == 2
+    assert await redis_client.zcard(CHUNKS_IN_FLIGHT_KEY) == 0
+    assert chunk_ids(await scheduler.release()) == chunk_ids(released)
+
+
+async def test_finished_chunks_are_not_requeued(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(1), priority=0)
+    await scheduler.release()
+    await scheduler.finish(campaign_id, f"{campaign_id}:0")
+
+    assert await scheduler.requeue([f"{campaign_id}:0"]) == 0
+    assert await scheduler.release() == []
+
+
+async def test_expired_leases_are_reclaimed(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client, lease_seconds=-1)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(2), priority=0)
+    released = await scheduler.release()
+
+    assert await scheduler.reclaim_expired() == 2
+    assert chunk_ids(await scheduler.release()) == chunk_ids(released)
+
+
+async def test_active_leases_are_not_reclaimed(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client)
+    await scheduler.enqueue(1, uuid.uuid4(), chunks(2), priority=0)
+    await scheduler.release()
+
+    assert await scheduler.reclaim_expired() == 0
+
+
+async def test_chunk_finished_while_requeued_is_skipped(
+    redis_client: FakeAsyncRedis,
+) -> None:
+    scheduler = build_scheduler(redis_client, lease_seconds=-1)
+    campaign_id = uuid.uuid4()
+    await scheduler.enqueue(1, campaign_id, chunks(2), priority=0)
+    await scheduler.release()
+    await scheduler.reclaim_expired()
+
+    # The slow worker still finishes its chunk after the lease was reclaimed
+    await scheduler.finish(campaign_id, f"{campaign_id}:0")
+
+    assert chunk_ids(await scheduler.release()) == [f"{campaign_id}:1"]
+
+
+async def test_all_keys_share_one_hash_slot(redis_client: FakeAsyncRedis) -> None:
+    scheduler = build_scheduler(redis_client)
+    await scheduler.enqueue(1, uuid.uuid4(), chunks(3), priority=0)
+    await scheduler.enqueue(2, uuid.uuid4(), chunks(3), priority=0)
+    await scheduler.release()
+
+    keys = await redis_client.keys("*")
+
+    assert keys
+    assert all(key.decode().startswith(f"{CHUNK_KEY_PREFIX}:") for key in keys)
@@ -0,0 +1,100 @@
+import base64
+import email
+from email import policy
+from email.header import decode_header, make_header
+from email.mime import base, multipart, text
+
+import pytest
+from campaigns.mime.compiled_template import CompiledTemplate
+from campaigns.mime.message_template import BODY_MARKER, MessageTemplate
+
+
+def build_skeleton(body: str | None = None) -> bytes:
+    msg = multipart.MIMEMultipart()
+    msg["From"] = "Sender <sender@example.com>"
+
+    if body is not None:
+        msg.attach(text.MIMEText(body, "html"))
+    else:
+        body_part = base.MIMEBase("text", "html", charset="utf-8")
+        body_part.set_payload(BODY_MARKER.decode("ascii"))
+        body_part["Content-Transfer-Encoding"] = "base64"
+        msg.attach(body_part)
+
+    return msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+
+
+def decode(raw: str) -> bytes:
+    return base64.urlsafe_b64decode(raw)
+
+
+def parse(raw: str) -> email.message.EmailMessage:
+    return email.message_from_bytes(decode(raw), policy=policy.default)
+
+
+# Recipients of every length modulo 3 exercise each padding of the prefix
+@pytest.mark.parametrize("recipient", ["a@b.co", "ab@b.co", "abc@b.co"])
+def test_static_message_decodes_to_skeleton(recipient: str) -> None:
+    skeleton = build_skeleton(body="<p>Hello</p>")
+    template = MessageTemplate(skeleton=skeleton, msgid_domain="example.com")
+
+    raw = template.render(recipient)
+    message = parse(raw)
+
+    assert decode(raw).endswith(skeleton)
+    assert message["To"] == recipient
+    assert message["Message-ID"].endswith("@example.com>")
+    assert message.get_body().get_content() == "<p>Hello</p>"
+
+
+def test_message_ids_are_unique_per_render() -> None:
+    template = MessageTemplate(skeleton=build_skeleton(body="x"))
+
+    first = parse(template.render("a@b.co"))["Message-ID"]
+    second = parse(template.render("a@b.co"))["Message-ID"]
+
+    assert first != second
+
+
+@pytest.mark.parametrize("recipient", ["a@b.co", "ab@b.co", "abc@b.co"])
+def test_personalized_body_is_rendered_and_escaped(recipient: str) -> None:
+    template = MessageTemplate(
+        skeleton=build_skeleton(),
+        body=CompiledTemplate("<p>Hi {{ name }}, ваш код {{code}}</p>"),
+    )
+
+    message = parse(template.render(recipient, {"name": "<Ann & Bob>", "code": "7"}))
+
+    assert message["To"] == recipient
+    assert (
+        message.get_body().get_content() == "<p>Hi &lt;Ann &amp; Bob&gt;, ваш код 7</p>"
+    )
+
+
+def test_missing_fields_render_empty() -> None:
+    template = MessageTemplate(
+        skeleton=build_skeleton(), body=CompiledTemplate("<p>Hi {{name}}!</p>")
+    )
+
+    message = parse(template.render("a@b.co"))
+
+    assert message.get_body().get_content() == "<p>Hi !</p>"
+
+
+def test_long_subject_is_folded_with_crlf() -> None:
+    subject = "Привет {{name}}, " + "очень длинная тема письма " * 10
+    template = MessageTemplate(
+        skeleton=build_skeleton(body="x"), subject=CompiledTemplate(subject)
+    )
+
+    raw = decode(template.render("a@b.co", {"name": "Анна"}))
+    headers = raw.split(b"\r\n\r\n", 1)[0]
+
+    assert b"\n" not in headers.replace(b"\r\n", b"")
+    assert all(len(line) <= 78 for line in headers.split(b"\r\n"))
+
+    message = email.message_from_bytes(raw)
+
+    assert str(make_header(decode_header(message["Subject"]))) == subject.replace(
+        "{{name}}", "Анна"
+    )
@@ -0,0 +1,33 @@
+import hashlib
+import io
+from pathlib import Path
+
+import pytest
+from common.storage.blob_store import LocalBlobStore
+from fastapi import UploadFile
+
+
+def test_available_root_passes_the_check(tmp_path: Path) -> None:
+    LocalBlobStore(root=str(tmp_path), chunk_size=4).check_available()
+
+
+@pytest.mark.parametrize("root", ["storage/blobs", "/nonexistent/quicksend/blobs"])
+def test_relative_or_missing_root_fails_the_check(root: str) -> None:
+    with pytest.raises(RuntimeError):
+        LocalBlobStore(root=root, chunk_size=4).check_available()
+
+
+async def test_upload_is_stored_by_digest(tmp_path: Path) -> None:
+    blob_store = LocalBlobStore(root=str(tmp_path), chunk_size=4)
+    content = b"attachment content"
+
+    digest, size = await blob_store.put_upload(
+        UploadFile(io.BytesIO(content), filename="a.txt")
+    )
+
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert size == len(content)
+    assert blob_store.exists(digest)
+
+    with blob_store.open(digest) as stored:
+        assert bytes(stored) == content
@@ -0,0 +1,30 @@
+from collections.abc import AsyncIterator
+
+import campaigns.models.attachment
+import campaigns.models.campaign
+import campaigns.models.recipient
+import campaigns.models.scheduled_campaign  # noqa: F401
+import google_integration.auth.models.google_token  # noqa: F401
+import payments.models.payment
+import payments.models.payment_webhook_event  # noqa: F401
+import pytest
+import subscriptions.models.subscription  # noqa: F401
+import users.models.user  # noqa: F401
+from common.db.database import Base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import configure_mappers
+
+
+# Every model is imported above, so relationships between them resolve
+@pytest.fixture
+async def db() -> AsyncIterator[AsyncSession]:
+    configure_mappers()
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+    await engine.dispose()
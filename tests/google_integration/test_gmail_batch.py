@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from google_integration.clients.google_api_error import GoogleApiError
+from google_integration.config.google_config import google_settings
+from google_integration.gmail.services.gmail_service import GoogleGmailService
+
+
+class FakeGmailApiClient:
+    def __init__(self, outcomes: list[Any]) -> None:
+        self.outcomes = outcomes
+        self.batches: list[list[str]] = []
+
+    async def send_messages_batch(
+        self, access_token: str, raws: list[str]
+    ) -> list[dict[str, Any] | GoogleApiError]:
+        self.batches.append(raws)
+        outcome = self.outcomes.pop(0)
+
+        if isinstance(outcome, GoogleApiError):
+            raise outcome
+
+        return [outcome.get(raw, {"id": raw}) for raw in raws]
+
+
+@pytest.fixture(autouse=True)
+def no_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(google_settings, "GMAIL_BATCH_RETRY_DELAY_SECONDS", 0)
+    monkeypatch.setattr(google_settings, "GMAIL_BATCH_MAX_RETRIES", 2)
+
+
+async def send(client: FakeGmailApiClient, raws: list[str]) -> list[Any]:
+    service = GoogleGmailService(google_token_manager=None, gmail_api_client=client)
+
+    return await service.send_emails_batch_via_gmail(
+        user=SimpleNamespace(id=1), raws=raws, access_token="token"
+    )
+
+
+async def test_only_retryable_parts_are_retried() -> None:
+    client = FakeGmailApiClient(
+        [{"b": GoogleApiError(429, "slow down"), "c": GoogleApiError(400, "bad")}, {}]
+    )
+
+    results = await send(client, ["a", "b", "c"])
+
+    assert client.batches == [["a", "b", "c"], ["b"]]
+    assert results[:2] == [{"id": "a"}, {"id": "b"}]
+    assert results[2].status_code == 400
+
+
+async def test_failed_batch_request_is_retried() -> None:
+    client = FakeGmailApiClient([GoogleApiError(503, "connection reset"), {}])
+
+    results = await send(client, ["a", "b"])
+
+    assert client.batches == [["a", "b"], ["a", "b"]]
+    assert results == [{"id": "a"}, {"id": "b"}]
+
+
+async def test_failed_retry_keeps_earlier_sends() -> None:
+    client = FakeGmailApiClient(
+        [{"b": GoogleApiError(500, "backend")}, GoogleApiError(401, "expired")]
+    )
+
+    results = await send(client, ["a", "b"])
+
+    assert results[0] == {"id": "a"}
+    assert results[1].status_code == 401
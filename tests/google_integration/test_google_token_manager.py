@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Self
+
+import pytest
+from google_integration.auth.services import google_token_manager as manager_module
+from google_integration.auth.services.google_token_manager import (
+    CachedGoogleToken,
+    GoogleTokenManager,
+)
+from google_integration.auth.services.google_token_refresh_error import (
+    GoogleTokenRefreshError,
+)
+
+
+class FakeSession:
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+
+def make_manager(max_size: int = 8) -> GoogleTokenManager:
+    return GoogleTokenManager(
+        refresh_skew=timedelta(seconds=300), max_size=max_size, ttl=3600
+    )
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    loads: list[int] = []
+
+    async def load_token(self, db: FakeSession, user_id: int) -> CachedGoogleToken:
+        loads.append(user_id)
+
+        return CachedGoogleToken(
+            f"token-{user_id}", datetime.now() + timedelta(seconds=3600)
+        )
+
+    monkeypatch.setattr(manager_module, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(GoogleTokenManager, "_load_token", load_token)
+
+    return loads
+
+
+async def test_tokens_are_cached(loads: list[int]) -> None:
+    manager = make_manager()
+
+    assert await manager.get_access_token(1) == "token-1"
+    assert await manager.get_access_token(1) == "token-1"
+    assert loads == [1]
+
+    manager.invalidate(1)
+
+    assert await manager.get_access_token(1) == "token-1"
+    assert loads == [1, 1]
+
+
+async def test_token_cache_is_bounded(loads: list[int]) -> None:
+    manager = make_manager(max_size=2)
+
+    for user_id in (1, 2, 3, 1):
+        await manager.get_access_token(user_id)
+
+    assert loads == [1, 2, 3, 1]
+
+
+async def test_missing_refresh_token_raises_refresh_error() -> None:
+    manager = make_manager()
+    google_token = SimpleNamespace(user_id=1, refresh_token=None)
+
+    with pytest.raises(GoogleTokenRefreshError) as error:
+        await manager._refresh_token(None, google_token)
+
+    assert error.value.user_id == 1
@@ -0,0 +1,169 @@
+import re
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+from google_integration.config.google_config import google_settings
+from google_integration.sheet.services.google_sheets_service import (
+    GoogleSheetsService,
+)
+
+
+@pytest.fixture
+def service() -> GoogleSheetsService:
+    return GoogleSheetsService(
+        sheets_api_client=None, drive_api_client=None, spreadsheet_cache=None
+    )
+
+
+@pytest.fixture(autouse=True)
+def page_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(google_settings, "SHEETS_IMPORT_PAGE_ROWS", 100)
+    monkeypatch.setattr(google_settings, "SHEETS_IMPORT_PAGES_PER_REQUEST", 2)
+
+
+@pytest.mark.parametrize(
+    ("range", "expected"),
+    [
+        ("Sheet1!B5:D100", ("Sheet1", "B", 5, "D", 100)),
+        ("Sheet1!a2:c", ("Sheet1", "A", 2, "C", None)),
+        ("'My ''best'' list'!A:A", ("My 'best' list", "A", 1, "A", None)),
+        ("Sheet1!", ("Sheet1", "", 1, "", None)),
+        ("Sheet1", ("Sheet1", "", 1, "", None)),
+        ("Data!3:250", ("Data", "", 3, "", 250)),
+        ("A:A", (None, "A", 1, "A", None)),
+        ("A1:B10", (None, "A", 1, "B", 10)),
+        ("B7", (None, "B", 7, "B", 7)),
+    ],
+)
+def test_parse_range(
+    service: GoogleSheetsService,
+    range: str,
+    expected: tuple[str | None, str, int, str, int | None],
+) -> None:
+    assert service._parse_range(range) == expected
+
+
+@pytest.mark.parametrize("range", ["Sheet1!A1:B2:C3", "Sheet1!A1-B2", "Sheet1!ABCD1"])
+def test_parse_range_rejects_invalid_cells(
+    service: GoogleSheetsService, range: str
+) -> None:
+    with pytest.raises(HTTPException) as error:
+        service._parse_range(range)
+
+    assert error.value.status_code == 400
+
+
+def test_pages_keep_the_requested_rows(service: GoogleSheetsService) -> None:
+    assert service._build_page_ranges("Sheet1", "B", "D", 5, 150) == [
+        "'Sheet1'!B5:D104",
+        "'Sheet1'!B105:D150",
+    ]
+
+
+def test_pages_of_an_open_range_fill_the_batch(service: GoogleSheetsService) -> None:
+    assert service._build_page_ranges("It's", "A", "C", 1, None) == [
+        "'It''s'!A1:C100",
+        "'It''s'!A101:C200",
+    ]
+
+
+def test_pages_without_a_sheet_are_not_quoted(service: GoogleSheetsService) -> None:
+    assert service._build_page_ranges(None, "A", "A", 1, None) == [
+        "A1:A100",
+        "A101:A200",
+    ]
+
+
+def test_pages_of_whole_rows(service: GoogleSheetsService) -> None:
+    assert service._build_page_ranges("Data", "", "", 3, 50) == ["'Data'!3:50"]
+
+
+def test_no_pages_past_the_end_row(service: GoogleSheetsService) -> None:
+    assert service._build_page_ranges("Sheet1", "A", "B", 11, 10) == []
+
+
+class FakeSheetsApiClient:
+    # Serves one sheet the way the Sheets API does: blank rows inside a range
+    # come back empty, trailing blank rows and empty ranges are left out
+    def __init__(self, rows: dict[int, list[str]]) -> None:
+        self._rows = rows
+        self.requested_ranges: list[list[str]] = []
+
+    async def batch_get_values(
+        self, access_token: str, spreadsheet_id: str, ranges: list[str]
+    ) -> list[dict[str, Any]]:
+        self.requested_ranges.append(ranges)
+
+        return [self._get_range(page_range) for page_range in ranges]
+
+    def _get_range(self, page_range: str) -> dict[str, Any]:
+        cells = page_range.split("!")[-1]
+        first_row, last_row = map(int, re.findall(r"\d+", cells))
+        values = [self._rows.get(row, []) for row in range(first_row, last_row + 1)]
+
+        while values and not values[-1]:
+            values.pop()
+
+        if not values:
+            return {"range": page_range}
+
+        return {"range": page_range, "values": values}
+
+
+async def collect_emails(client: FakeSheetsApiClient, range: str) -> list[str]:
+    service = GoogleSheetsService(
+        sheets_api_client=client, drive_api_client=None, spreadsheet_cache=None
+    )
+
+    return [
+        row["email"]
+        async for rows in service.iter_spreadsheet_rows("sheet", range, "token")
+        for row in rows
+    ]
+
+
+def sheet_with_gap() -> dict[int, list[str]]:
+    rows = {1: ["Name", "Email"]}
+    rows |= {row: ["User", f"user{row}@example.com"] for row in range(2, 51)}
+    # Rows 51 to 349 are blank, well past a page and a half
+    rows |= {row: ["User", f"user{row}@example.com"] for row in range(350, 401)}
+
+    return rows
+
+
+async def test_open_range_reads_past_a_blank_gap() -> None:
+    client = FakeSheetsApiClient(sheet_with_gap())
+
+    emails = await collect_emails(client, "Sheet1!A:B")
+
+    assert emails == [
+        f"user{row}@example.com" for row in [*range(2, 51), *range(350, 401)]
+    ]
+    # The batch after the last row comes back empty and ends the import
+    assert client.requested_ranges[-1] == ["'Sheet1'!A401:B500", "'Sheet1'!A501:B600"]
+
+
+async def test_bounded_range_reads_to_its_end_row() -> None:
+    client = FakeSheetsApiClient(sheet_with_gap())
+
+    emails = await collect_emails(client, "Sheet1!A1:B360")
+
+    assert emails == [
+        f"user{row}@example.com" for row in [*range(2, 51), *range(350, 361)]
+    ]
+    assert client.requested_ranges == [
+        ["'Sheet1'!A1:B100", "'Sheet1'!A101:B200"],
+        ["'Sheet1'!A201:B300", "'Sheet1'!A301:B360"],
+    ]
+
+
+async def test_range_starting_below_the_header_row() -> None:
+    client = FakeSheetsApiClient(
+        {row: [f"user{row}@example.com"] for row in range(1, 31)}
+    )
+
+    emails = await collect_emails(client, "A5:A10")
+
+    assert emails == [f"user{row}@example.com" for row in range(5, 11)]
+    assert client.requested_ranges == [["A5:A10"]]
@@ -0,0 +1,72 @@
+from typing import Any
+
+from google_integration.clients.google_api_error import GoogleApiError
+from google_integration.sheet.services import google_sheets_service
+from google_integration.sheet.services.google_sheets_service import (
+    GoogleSheetsService,
+)
+from google_integration.sheet.services.spreadsheet_cache import SpreadsheetCache
+
+
+class FakeDriveApiClient:
+    def __init__(self, error: GoogleApiError | None = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def get_file(self, **kwargs: Any) -> dict[str, Any]:
+        self.calls += 1
+
+        if self.error is not None:
+            raise self.error
+
+        return {"version": "7"}
+
+
+class FakeLogger:
+    def __init__(self) -> None:
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        self.warnings.append(message)
+
+
+def make_service(drive_api_client: FakeDriveApiClient) -> GoogleSheetsService:
+    return GoogleSheetsService(
+        sheets_api_client=None,
+        drive_api_client=drive_api_client,
+        spreadsheet_cache=SpreadsheetCache(max_size=8, ttl=60, denied_ttl=60),
+    )
+
+
+async def test_revision_is_read_from_drive() -> None:
+    service = make_service(FakeDriveApiClient())
+
+    assert await service.get_spreadsheet_revision("sheet", "token", 1) == "7"
+
+
+async def test_missing_scope_is_logged_once_per_user(monkeypatch) -> None:
+    logger = FakeLogger()
+    monkeypatch.setattr(google_sheets_service, "logger", logger)
+    drive_api_client = FakeDriveApiClient(GoogleApiError(403, "insufficient scopes"))
+    service = make_service(drive_api_client)
+
+    for _ in range(3):
+        assert await service.get_spreadsheet_revision("sheet", "token", 1) is None
+
+    assert drive_api_client.calls == 1
+    assert len(logger.warnings) == 1
+
+    assert await service.get_spreadsheet_revision("sheet", "token", 2) is None
+    assert drive_api_client.calls == 2
+    assert len(logger.warnings) == 2
+
+
+async def test_other_errors_do_not_disable_revisions(monkeypatch) -> None:
+    monkeypatch.setattr(google_sheets_service, "logger", FakeLogger())
+    drive_api_client = FakeDriveApiClient(GoogleApiError(500, "backend error"))
+    service = make_service(drive_api_client)
+
+    for _ in range(2):
+        assert await service.get_spreadsheet_revision("sheet", "token", 1) is None
+
+    assert drive_api_client.calls == 2
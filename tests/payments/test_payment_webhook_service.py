@@ -0,0 +1,236 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from payments.clients.yookassa_api_error import YookassaApiError
+from payments.config.payment_config import payment_settings
+from payments.enum.payment_status import PaymentStatus as PaymentStatusEnum
+from payments.enum.provider import PaymentProvider
+from payments.models.payment import Payment
+from payments.models.payment_webhook_event import PaymentWebhookEvent
+from payments.schemas.base.payment_status import PaymentStatus
+from payments.services import payment_webhook_service as service_module
+from payments.services.payment_webhook_service import PaymentWebhookService
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from subscriptions.enum.plan import SubscriptionPlan
+from subscriptions.models.subscription import Subscription
+from users.models.user import User
+
+
+class FakePaymentProvider:
+    def __init__(self, statuses: dict[str, str | Exception]) -> None:
+        self._statuses = statuses
+        self.requested_ids: list[str] = []
+
+    async def get_payment_status(self, payment_id: str) -> PaymentStatus:
+        self.requested_ids.append(payment_id)
+        status = self._statuses[payment_id]
+
+        if isinstance(status, Exception):
+            raise status
+
+        return PaymentStatus(
+            payment_id=payment_id,
+            status=status,
+            paid_at=datetime(2026, 1, 1) if status == "succeeded" else None,
+            payment_method="bank_card",
+            metadata={},
+        )
+
+
+class FakePaymentProviderFactory:
+    def __init__(self, provider: FakePaymentProvider) -> None:
+        self._provider = provider
+
+    def create(self, provider: PaymentProvider) -> FakePaymentProvider:
+        return self._provider
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self.invalidated: list[int] = []
+
+    async def invalidate(self, key: int) -> None:
+        self.invalidated.append(key)
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch: pytest.MonkeyPatch) -> tuple[FakeCache, FakeCache]:
+    entitlement_cache, identity_cache = FakeCache(), FakeCache()
+    monkeypatch.setattr(
+        service_module, "subscription_entitlement_cache", entitlement_cache
+    )
+    monkeypatch.setattr(service_module, "user_identity_cache", identity_cache)
+
+    return entitlement_cache, identity_cache
+
+
+async def add_payment(
+    db: AsyncSession,
+    external_payment_id: str,
+    status: PaymentStatusEnum = PaymentStatusEnum.PENDING,
+) -> Payment:
+    user = User(email=f"{external_payment_id}@example.com")
+    subscription = Subscription(
+        plan=SubscriptionPlan.STANDARD,
+        is_active=False,
+        end_at=datetime(2026, 2, 1),
+        user=user,
+    )
+    payment = Payment(
+        user=user,
+        subscription=subscription,
+        external_payment_id=external_payment_id,
+        provider=PaymentProvider.YOOKASSA,
+        amount=Decimal(100),
+        status=status,
+    )
+    db.add_all([user, subscription, payment])
+    await db.commit()
+
+    return payment
+
+
+async def add_event(
+    db: AsyncSession, external_payment_id: str, event: str
+) -> PaymentWebhookEvent:
+    webhook_event = PaymentWebhookEvent(
+        provider=PaymentProvider.YOOKASSA,
+        external_payment_id=external_payment_id,
+        event=event,
+        payload={},
+        attempts=0,
+        received_at=datetime(2026, 1, 1),
+    )
+    db.add(webhook_event)
+    await db.commit()
+
+    return webhook_event
+
+
+async def process(db: AsyncSession, provider: FakePaymentProvider) -> int:
+    service = PaymentWebhookService(
+        db=db, payment_provider_factory=FakePaymentProviderFactory(provider)
+    )
+
+    return await service.process_pending_events(limit=100)
+
+
+async def test_verified_event_updates_the_payment(
+    db: AsyncSession, caches: tuple[FakeCache, FakeCache]
+) -> None:
+    payment = await add_payment(db, "pay-1")
+    event = await add_event(db, "pay-1", "payment.succeeded")
+
+    processed_count = await process(db, FakePaymentProvider({"pay-1": "succeeded"}))
+
+    assert processed_count == 1
+    assert event.processed_at is not None
+    assert payment.status == PaymentStatusEnum.SUCCESS
+    assert payment.paid_at == datetime(2026, 1, 1)
+    assert payment.subscription.is_active
+    assert payment.subscription.last_payment_id == payment.id
+    assert caches[0].invalidated == caches[1].invalidated == [payment.user_id]
+
+
+async def test_status_is_read_from_the_provider_not_the_event(
+    db: AsyncSession,
+) -> None:
+    payment = await add_payment(db, "pay-1")
+    await add_event(db, "pay-1", "payment.succeeded")
+
+    await process(db, FakePaymentProvider({"pay-1": "canceled"}))
+
+    assert payment.status == PaymentStatusEnum.CANCELED
+    assert not payment.subscription.is_active
+
+
+async def test_events_of_one_payment_are_verified_once(db: AsyncSession) -> None:
+    await add_payment(db, "pay-1")
+    await add_event(db, "pay-1", "payment.waiting_for_capture")
+    await add_event(db, "pay-1", "payment.succeeded")
+    provider = FakePaymentProvider({"pay-1": "succeeded"})
+
+    processed_count = await process(db, provider)
+
+    assert processed_count == 2
+    assert provider.requested_ids == ["pay-1"]
+
+
+async def test_settled_payment_is_not_reopened(db: AsyncSession) -> None:
+    payment = await add_payment(db, "pay-1", PaymentStatusEnum.SUCCESS)
+    event = await add_event(db, "pay-1", "payment.canceled")
+
+    await process(db, FakePaymentProvider({"pay-1": "canceled"}))
+
+    assert event.processed_at is not None
+    assert payment.status == PaymentStatusEnum.SUCCESS
+
+
+async def test_event_without_a_local_payment_is_retried(db: AsyncSession) -> None:
+    event = await add_event(db, "pay-unknown", "payment.succeeded")
+
+    processed_count = await process(
+        db, FakePaymentProvider({"pay-unknown": "succeeded"})
+    )
+
+    assert processed_count == 0
+    assert event.processed_at is None
+    assert event.attempts == 1
+
+    # Once the payment is stored the next run applies the event
+    payment = await add_payment(db, "pay-unknown")
+
+    processed_count = await process(
+        db, FakePaymentProvider({"pay-unknown": "succeeded"})
+    )
+
+    assert processed_count == 1
+    assert event.processed_at is not None
+    assert payment.status == PaymentStatusEnum.SUCCESS
+
+
+async def test_failed_verification_is_retried(db: AsyncSession) -> None:
+    payment = await add_payment(db, "pay-1")
+    event = await add_event(db, "pay-1", "payment.succeeded")
+
+    await process(db, FakePaymentProvider({"pay-1": YookassaApiError(503, "timeout")}))
+
+    assert event.processed_at is None
+    assert event.attempts == 1
+    assert payment.status == PaymentStatusEnum.PENDING
+
+
+async def test_event_is_given_up_after_max_attempts(
+    db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(payment_settings, "PAYMENT_WEBHOOK_MAX_ATTEMPTS", 2)
+    event = await add_event(db, "pay-unknown", "payment.succeeded")
+    provider = FakePaymentProvider({"pay-unknown": "succeeded"})
+
+    await process(db, provider)
+    await process(db, provider)
+    processed_count = await process(db, provider)
+
+    assert processed_count == 0
+    assert event.attempts == 2
+    assert event.processed_at is not None
+    assert provider.requested_ids == ["pay-unknown", "pay-unknown"]
+
+
+async def test_processed_events_are_not_picked_up_again(db: AsyncSession) -> None:
+    await add_payment(db, "pay-1")
+    await add_event(db, "pay-1", "payment.succeeded")
+    provider = FakePaymentProvider({"pay-1": "succeeded"})
+
+    await process(db, provider)
+    processed_count = await process(db, provider)
+
+    pending = await db.scalars(
+        select(PaymentWebhookEvent).where(PaymentWebhookEvent.processed_at.is_(None))
+    )
+
+    assert processed_count == 0
+    assert provider.requested_ids == ["pay-1"]
+    assert pending.all() == []
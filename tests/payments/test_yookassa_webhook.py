@@ -0,0 +1,94 @@
+from typing import Any
+
+import pytest
+from payments.config.payment_config import payment_settings
+from payments.routes.payment_webhook_routes import get_sender_ip
+from payments.services.payment_webhook_error import PaymentWebhookError
+from payments.services.yookassa_payment_provider import YookassaPaymentProvider
+from starlette.requests import Request
+
+PAYMENT_ID = "22e12f66-000f-5000-8000-18db351245c7"
+YOOKASSA_IP = "185.71.76.10"
+
+
+def notification(**changes: Any) -> dict[str, Any]:
+    data = {
+        "type": "notification",
+        "event": "payment.succeeded",
+        "object": {
+            "id": PAYMENT_ID,
+            "status": "succeeded",
+            "captured_at": "2026-01-01T10:00:00.000Z",
+            "payment_method": {"id": PAYMENT_ID, "type": "bank_card"},
+            "metadata": {"subscription_id": "1"},
+        },
+    }
+
+    return data | changes
+
+
+@pytest.fixture
+def provider() -> YookassaPaymentProvider:
+    return YookassaPaymentProvider(yookassa_api_client=None)
+
+
+async def test_notification_from_yookassa_is_accepted(
+    provider: YookassaPaymentProvider,
+) -> None:
+    payment_status = await provider.verify_webhook(notification(), YOOKASSA_IP)
+
+    assert payment_status.payment_id == PAYMENT_ID
+    assert payment_status.status == "succeeded"
+    assert payment_status.paid_at is not None
+
+
+@pytest.mark.parametrize(
+    "sender_ip", ["8.8.8.8", "185.71.76.32", "2a02:5181::1", "", "not-an-ip"]
+)
+async def test_notification_from_other_senders_is_rejected(
+    provider: YookassaPaymentProvider, sender_ip: str
+) -> None:
+    with pytest.raises(PaymentWebhookError):
+        await provider.verify_webhook(notification(), sender_ip)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        notification(type="ping"),
+        notification(event="refund.succeeded"),
+        notification(object=None),
+        notification(object={"id": 1, "status": "succeeded"}),
+        notification(object={"id": "made-up", "status": "succeeded"}),
+        notification(object={"id": PAYMENT_ID, "status": "canceled"}),
+    ],
+)
+async def test_malformed_notification_is_rejected(
+    provider: YookassaPaymentProvider, data: dict[str, Any]
+) -> None:
+    with pytest.raises(PaymentWebhookError):
+        await provider.verify_webhook(data, "2a02:5180::1")
+
+
+def build_request(peer_ip: str, real_ip: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "client": (peer_ip, 40000),
+            "headers": [(b"x-real-ip", real_ip.encode())],
+        }
+    )
+
+
+def test_sender_ip_is_the_peer_by_default() -> None:
+    assert get_sender_ip(build_request("203.0.113.5", YOOKASSA_IP)) == "203.0.113.5"
+
+
+def test_sender_ip_is_forwarded_by_a_trusted_proxy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        payment_settings, "PAYMENT_WEBHOOK_TRUSTED_PROXIES", ["172.70.0.3"]
+    )
+
+    assert get_sender_ip(build_request("172.70.0.3", YOOKASSA_IP)) == YOOKASSA_IP